@@ -1,123 +1,458 @@
 import os
-import urllib.request
-from PyQt6.QtCore import QThread, pyqtSignal
+import time
+from bisect import bisect_left
+from functools import partial
+from collections import OrderedDict
+from PyQt6.QtCore import QThread, QTimer, pyqtSignal
 from PyQt6.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+from browser.blocklist import (CompiledBlocklist, FetchInterrupted, fetch_blocklist,
+                               load_blocklist, match_domain, write_compiled)
+from browser.filters import FilterEngine, base_domain, is_third_party
+from browser.governor import LEVEL_DROP_TEXT
+
+# Built-in network rules (EasyList syntax), always active even without a filter list
+BUILTIN_FILTERS = """
+! Strict YouTube ad blocking: YouTube serves ads from its own domains, identified by path
+||youtube.com/pagead/
+||youtube.com/ptracking
+||youtube.com/api/stats/ads
+||youtube.com^*&ad_format=
+||youtube.com^*&ad_type=
+||googlevideo.com^*&ad_format=
+||googlevideo.com^*&ad_type=
+! Universal ad-query blocker (aggressive)
+google_ads
+doubleclick.net
+"""
+
+# We use StevenBlack's Unified Hosts List (combines AdAway, MVP, etc.)
+# It's the gold standard for system-wide adblocking.
+BLOCKLIST_URL = "https://raw.githubusercontent.com/StevenBlack/hosts/master/hosts"
+BLOCKLIST_PATH = "adblock_list.txt"
+# Re-check the remote list once a day (conditional GET, usually a cheap 304)
+BLOCKLIST_REFRESH_MS = 24 * 60 * 60 * 1000
+# How long shutdown() waits for an interrupted loader/updater (one socket read at worst)
+THREAD_STOP_WAIT_MS = 3000
+
+def _data_path(name):
+    # Compiled lists and download metadata live with the rest of the user data
+    cache_dir = os.path.join(os.path.expanduser("~"), ".xenit_browser")
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, name)
+
+# Optional EasyList / ABP filter list, loaded next to adblock_list.txt when present
+FILTER_LIST_PATH = "easylist.txt"
+
+# QWebEngine resource types -> filter option names ($script, $image, ...)
+_RT = QWebEngineUrlRequestInfo.ResourceType
+RESOURCE_TYPE_NAMES = {
+    _RT.ResourceTypeMainFrame: "document",
+    _RT.ResourceTypeSubFrame: "subdocument",
+    _RT.ResourceTypeStylesheet: "stylesheet",
+    _RT.ResourceTypeScript: "script",
+    _RT.ResourceTypeImage: "image",
+    _RT.ResourceTypeFavicon: "image",
+    _RT.ResourceTypeFontResource: "font",
+    _RT.ResourceTypeObject: "object",
+    _RT.ResourceTypePluginResource: "object",
+    _RT.ResourceTypeMedia: "media",
+    _RT.ResourceTypeXhr: "xmlhttprequest",
+    _RT.ResourceTypePing: "ping",
+    _RT.ResourceTypeCspReport: "ping",
+}
+if hasattr(_RT, "ResourceTypeWebSocket"): # Qt 6.4+
+    RESOURCE_TYPE_NAMES[_RT.ResourceTypeWebSocket] = "websocket"
+
+# Decision routes, cheapest first:
+#   ROUTE_HOST_ONLY - top-level documents, media segments, fonts, first-party
+#                     images/CSS: only the (cached) host verdict applies
+#   ROUTE_BUILTIN   - other first-party requests: the small built-in rule set
+#                     (YouTube serves its ad endpoints first-party)
+#   ROUTE_FULL      - third-party active content: the full filter list
+ROUTE_HOST_ONLY, ROUTE_BUILTIN, ROUTE_FULL = range(3)
+_HOST_ONLY_TYPES = {"document", "media", "font"}
+_PASSIVE_TYPES = {"image", "stylesheet"}
+_PASSIVE_THIRD_PARTY_TYPES = {"stylesheet"}
+
+def request_route(resource_type, third_party):
+    if resource_type in _HOST_ONLY_TYPES:
+        return ROUTE_HOST_ONLY
+    if not third_party:
+        return ROUTE_HOST_ONLY if resource_type in _PASSIVE_TYPES else ROUTE_BUILTIN
+    if resource_type in _PASSIVE_THIRD_PARTY_TYPES:
+        return ROUTE_HOST_ONLY
+    return ROUTE_FULL
+
+def _lines_until(should_stop, lines):
+    for line in lines:
+        if should_stop():
+            return
+        yield line
+
+def build_filter_engine(filter_list_path=FILTER_LIST_PATH, should_stop=None):
+    """Compiles the built-in rules plus the optional filter list into one engine.
+
+    If should_stop returns True the list is cut short; the caller checks it
+    again and throws the partial engine away.
+    """
+    engine = FilterEngine()
+    engine.add_filters(BUILTIN_FILTERS.splitlines())
+    if os.path.exists(filter_list_path):
+        try:
+            with open(filter_list_path, 'r', encoding='utf-8', errors='ignore') as f:
+                engine.add_filters(f if should_stop is None else _lines_until(should_stop, f))
+        except Exception as e:
+            print(f"Error reading filter list: {e}")
+    return engine
+
+class DecisionCache:
+    """Bounded LRU of block/allow verdicts with hit/miss counters.
+
+    The interceptor keeps two: host-list verdicts keyed by host, and filter
+    verdicts keyed by (host, path, resource type, first-party host) for
+    requests without a query string. Filter rules can look at any part of the
+    path and query ("&ad_format=", "/ads/1234/"), so verdicts are only reused
+    for the exact same request, and URLs with a query (nearly always unique
+    cache-busters) aren't cached at all. Qt 6 calls interceptRequest() on the
+    UI thread, the same thread that clears the caches, so no locking is needed.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        blocked = self._entries.get(key)
+        if blocked is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return blocked
+
+    def put(self, key, blocked):
+        self._entries[key] = blocked
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries = OrderedDict()
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+class AdBlockStats:
+    """Counters for the interceptor: requests, blocks per rule category, decision latency.
+
+    Qt 6 runs interceptRequest() on the UI thread, so the writer and every
+    reader (task manager, xenit://adblock, shrink()) share one thread and no
+    locking is needed.
+    """
+    # Upper bounds of the latency histogram buckets, in microseconds (last bucket is open)
+    LATENCY_BUCKETS_US = (5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+    CATEGORIES = ("host", "builtin", "filters")
+    MAX_SITES = 2000
+
+    def __init__(self):
+        self.requests = 0
+        self.blocked = dict.fromkeys(self.CATEGORIES, 0)
+        self.latency = [0] * (len(self.LATENCY_BUCKETS_US) + 1)
+        self.total_ns = 0
+        self.started = time.time()
+        # First-party site -> [requests, blocked], for the task manager
+        self.sites = {}
+
+    def record(self, category, elapsed_ns, site=""):
+        self.requests += 1
+        counts = self.sites.get(site)
+        if counts is None:
+            if len(self.sites) >= self.MAX_SITES:
+                self.sites.clear()
+            counts = self.sites[site] = [0, 0]
+        counts[0] += 1
+        if category is not None:
+            self.blocked[category] += 1
+            counts[1] += 1
+        self.total_ns += elapsed_ns
+        self.latency[bisect_left(self.LATENCY_BUCKETS_US, elapsed_ns / 1000)] += 1
+
+    def snapshot(self, caches=None):
+        """Returns a plain dict copy, safe to hand to the UI."""
+        snap = {
+            "requests": self.requests,
+            "blocked": dict(self.blocked),
+            "blocked_total": sum(self.blocked.values()),
+            "avg_latency_us": (self.total_ns / self.requests / 1000) if self.requests else 0.0,
+            "latency_buckets_us": list(self.LATENCY_BUCKETS_US),
+            "latency_histogram": list(self.latency),
+            "uptime_s": time.time() - self.started,
+        }
+        # {name: {hits, misses, hit_rate}} per decision cache
+        snap["caches"] = {
+            name: {"hits": cache.hits, "misses": cache.misses, "hit_rate": cache.hit_rate()}
+            for name, cache in (caches or {}).items()
+        }
+        return snap
+
+    def site_counts(self):
+        """{site: (requests, blocked)} per first-party site."""
+        return {site: tuple(counts) for site, counts in list(self.sites.items())}
 
 class BlocklistLoader(QThread):
-    loaded = pyqtSignal(set)
+    loaded = pyqtSignal(object)
+    filters_loaded = pyqtSignal(object)
     
     def run(self):
-        hosts = set()
-        blocklist_path = "adblock_list.txt"
-        
-        # We use StevenBlack's Unified Hosts List (combines AdAway, MVP, etc.)
-        # It's the gold standard for system-wide adblocking.
-        blocklist_url = "https://raw.githubusercontent.com/StevenBlack/hosts/master/hosts"
+        # Pattern rules (EasyList) are compiled here, off the UI thread
+        # Every step checks isInterruptionRequested() so shutdown() isn't kept waiting
+        if os.path.exists(FILTER_LIST_PATH):
+            engine = build_filter_engine(should_stop=self.isInterruptionRequested)
+            if self.isInterruptionRequested():
+                return
+            print(f"XeNit AdBlock: {engine.rule_count} network filter rules compiled.")
+            self.filters_loaded.emit(engine)
         
-        # Try local first
-        if os.path.exists(blocklist_path):
-            try:
-                with open(blocklist_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            # Handle "0.0.0.0 domain.com" or just "domain.com"
-                            parts = line.split()
-                            if len(parts) >= 2 and (parts[0] == "0.0.0.0" or parts[0] == "127.0.0.1"):
-                                hosts.add(parts[1])
-                            elif len(parts) == 1:
-                                hosts.add(parts[0])
-            except Exception as e:
-                print(f"Error reading local blocklist: {e}")
+        cache_path = _data_path("adblock_list.bin")
         
-        # If empty or missing, download
-        if not hosts:
+        # If empty or missing, download (parsed and compiled while it streams in)
+        if not os.path.exists(BLOCKLIST_PATH) or os.path.getsize(BLOCKLIST_PATH) == 0:
             try:
                 print("Downloading massive unified adblock list (StevenBlack)...")
-                
-                # Set a proper User-Agent to avoid 403 Forbidden from GitHub
-                req = urllib.request.Request(
-                    blocklist_url, 
-                    headers={'User-Agent': 'Mozilla/5.0'}
-                )
-                
-                with urllib.request.urlopen(req) as response:
-                    data = response.read().decode('utf-8')
-                    # Save for offline use
-                    with open(blocklist_path, 'w', encoding='utf-8') as f:
-                        f.write(data)
-                    
-                    for line in data.splitlines():
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            parts = line.split()
-                            # Hosts format: 0.0.0.0 ad.doubleclick.net
-                            if len(parts) >= 2 and (parts[0] == "0.0.0.0" or parts[0] == "127.0.0.1"):
-                                hosts.add(parts[1])
-                            # Raw domain list support just in case
-                            elif len(parts) == 1:
-                                hosts.add(parts[0])
-                                
-                print(f"Downloaded {len(hosts)} rules. Total Shield Active.")
+                hashes = fetch_blocklist(BLOCKLIST_URL, BLOCKLIST_PATH, _data_path("adblock_list.meta.json"),
+                                         should_stop=self.isInterruptionRequested)
+                if hashes is not None:
+                    write_compiled(hashes, BLOCKLIST_PATH, cache_path)
+            except FetchInterrupted:
+                return
             except Exception as e:
                 print(f"Error downloading blocklist: {e}")
+                return
+        
+        # Memory-map the compiled list (rebuilt only when the source file changed)
+        try:
+            blocklist = load_blocklist(BLOCKLIST_PATH, cache_path)
+        except Exception as e:
+            print(f"Error loading blocklist: {e}")
+            return
+        if self.isInterruptionRequested():
+            return
                 
-        self.loaded.emit(hosts)
+        self.loaded.emit(blocklist)
+
+class BlocklistUpdater(QThread):
+    """Background refresh: conditional download, diff against the live list, emit the new index."""
+    updated = pyqtSignal(object)
+    
+    def __init__(self, current=None, parent=None):
+        super().__init__(parent)
+        self.current = current
+    
+    def run(self):
+        try:
+            hashes = fetch_blocklist(BLOCKLIST_URL, BLOCKLIST_PATH, _data_path("adblock_list.meta.json"),
+                                     should_stop=self.isInterruptionRequested)
+        except FetchInterrupted:
+            return
+        except Exception as e:
+            print(f"XeNit AdBlock: Blocklist refresh failed: {e}")
+            return
+        if hashes is None:
+            return # 304 Not Modified
+        
+        old = self.current.hashes() if self.current is not None else set()
+        added = len(hashes - old)
+        removed = len(old - hashes)
+        
+        try:
+            # Always re-stamp the cache so the next start doesn't re-parse the new text
+            path = write_compiled(hashes, BLOCKLIST_PATH, _data_path("adblock_list.bin"))
+            if not added and not removed:
+                return
+            blocklist = CompiledBlocklist(path)
+        except Exception as e:
+            print(f"XeNit AdBlock: Could not compile refreshed blocklist: {e}")
+            return
+        
+        print(f"XeNit AdBlock: Blocklist refreshed (+{added} / -{removed} hosts).")
+        self.updated.emit(blocklist)
 
 class AdBlockInterceptor(QWebEngineUrlRequestInterceptor):
     def __init__(self, parent=None):
         super().__init__(parent)
         # Start with essential hardcoded blocks for immediate protection
+        # (matched by suffix, so these also cover every subdomain)
         self.blocked_hosts = {
             "doubleclick.net", "adservice.google.com", "googlesyndication.com", "google-analytics.com",
             "adserver.com", "adnxs.com", "pagead2.googlesyndication.com",
-            "facebook.com/tr", "connect.facebook.net", "platform.twitter.com",
+            "connect.facebook.net", "platform.twitter.com",
             # ... keep some key ones for startup speed ...
-             "youtube.com/ads", "popads.net"
+            "popads.net", "googletagmanager.com", "googletagservices.com", "googleadservices.com",
+            "analytics.google.com", "pixel.facebook.com", "scorecardresearch.com"
         }
         
-        # Start async loader
-        self.loader = BlocklistLoader()
+        # Compiled, memory-mapped host list (None until the loader finishes)
+        self.blocklist = None
+        
+        # URL pattern rules; the loader swaps in the full list once it's compiled.
+        # The built-in set is also kept on its own for cheap first-party checks.
+        self.builtin_filters = FilterEngine()
+        self.builtin_filters.add_filters(BUILTIN_FILTERS.splitlines())
+        self.filters = self.builtin_filters
+        
+        # Verdicts for repeat requests: host lookups and (query-less) filter matches
+        # kept apart, so a busy page's filter keys can't evict the host verdicts
+        self.host_decisions = DecisionCache(4096)
+        self.filter_decisions = DecisionCache(1024)
+        self.stats = AdBlockStats()
+        
+        # Start async loader (a child, so it can't outlive us unnoticed; see shutdown())
+        self.loader = BlocklistLoader(self)
         self.loader.loaded.connect(self.update_blocklist)
+        self.loader.filters_loaded.connect(self.update_filters)
         self.loader.start()
+        
+        # Periodic background refresh of the hosts list
+        self.updater = None
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh_blocklist)
+        self.refresh_timer.start(BLOCKLIST_REFRESH_MS)
+        # First check shortly after startup, once the local list is armed
+        QTimer.singleShot(60 * 1000, self.refresh_blocklist)
 
-    def update_blocklist(self, new_hosts):
-        self.blocked_hosts.update(new_hosts)
-        print(f"AdBlock Logic Fully Armed: {len(self.blocked_hosts)} domains blocked.")
+    def update_blocklist(self, blocklist):
+        self.blocklist = blocklist
+        self.host_decisions.clear()
+        print(f"AdBlock Logic Fully Armed: {len(self.blocked_hosts) + len(blocklist)} domains blocked.")
+
+    def refresh_blocklist(self):
+        # The first-run loader downloads into the same .part/meta/cache files
+        if self.loader.isRunning() or (self.updater is not None and self.updater.isRunning()):
+            return
+        self.updater = BlocklistUpdater(self.blocklist, self)
+        # Same hot-swap path as the initial load: the index is built on the
+        # updater thread and swapped in by one assignment on the UI thread,
+        # between two interceptRequest() calls
+        self.updater.updated.connect(self.update_blocklist)
+        self.updater.start()
+
+    def update_filters(self, engine):
+        self.filters = engine
+        self.filter_decisions.clear()
+
+    def shutdown(self):
+        """Stops refreshing and interrupts the loader/updater threads, so deleting
+        this object never destroys a QThread that is still running.
+
+        A thread still stuck in a socket read after THREAD_STOP_WAIT_MS is
+        detached and kept alive in _stopping_threads until it finishes.
+        """
+        self.refresh_timer.stop()
+        for thread in (self.loader, self.updater):
+            if thread is None or not thread.isRunning():
+                continue
+            thread.requestInterruption()
+            if not thread.wait(THREAD_STOP_WAIT_MS):
+                print("XeNit AdBlock: Blocklist thread still busy, letting it finish in the background.")
+                thread.setParent(None)
+                _stopping_threads.add(thread)
+                thread.finished.connect(partial(_stopping_threads.discard, thread))
+
+    def stats_snapshot(self):
+        return self.stats.snapshot({"host": self.host_decisions, "filter": self.filter_decisions})
+
+    def shrink(self, level):
+        """Memory governor relief. Runs on the UI thread like interceptRequest(),
+        so it can't overlap a decision in progress."""
+        self.host_decisions.clear()
+        self.filter_decisions.clear()
+        self.stats.sites = {}
+        if level >= LEVEL_DROP_TEXT:
+            self.filters.release_compiled()
 
     def interceptRequest(self, info: QWebEngineUrlRequestInfo):
-        url_str = info.requestUrl().toString().lower()
-        host = info.requestUrl().host().lower()
-        
-        # 1. Host-based Blocking (Fast)
-        if host in self.blocked_hosts:
+        # Hot path: no printing here, everything goes through the counters
+        start = time.perf_counter_ns()
+        category = self._decide(info)
+        if category is not None:
             info.block(True)
-            return
+        site = base_domain(info.firstPartyUrl().host().lower().rstrip('.'))
+        self.stats.record(category, time.perf_counter_ns() - start, site)
 
-        # 2. Strict YouTube Ad Blocking (Path/Query based)
-        # YouTube loads ads from the same domain or google domains, often identified by path.
-        if "youtube.com" in host or "googlevideo.com" in host:
-            # Block ad-specific API endpoints
-            if "/pagead/" in url_str or \
-               "/ptracking" in url_str or \
-               "/api/stats/ads" in url_str or \
-               "&ad_format=" in url_str or \
-               "&ad_type=" in url_str:
-                info.block(True)
-                print(f"XeNit AdBlock: Blocked YouTube Ad Request -> {url_str[:50]}...")
-                return
+    def _decide(self, info):
+        """Returns the rule category that blocks this request, or None to allow it."""
+        url = info.requestUrl()
+        # Normalize FQDN hosts (YouTube "dot trick") so anchored rules still match
+        raw_host = url.host().lower()
+        host = raw_host.rstrip('.')
+        
+        # 1. Host-based Blocking (Fast): the host or any parent domain is listed
+        blocked = self.host_decisions.get(host)
+        if blocked is None:
+            blocked = bool(match_domain(host, self.blocked_hosts) or
+                           (self.blocklist is not None and match_domain(host, self.blocklist)))
+            self.host_decisions.put(host, blocked)
+        if blocked:
+            return "host"
 
-        # 3. Keyword / Pattern Blocking for other sites
-        critical_keywords = ["doubleclick", "adservice", "googlesyndication", "pixel", "tracker", "analytics"]
-        for kw in critical_keywords:
-            if kw in host:
-                info.block(True)
-                return
-                
-        # 4. Universal Ad-Query Blocker (Aggressive)
-        # Blocks any request with explicit ad params
-        if "google_ads" in url_str or "doubleclick.net" in url_str:
-             info.block(True)
-             return
+        # 2. Route by resource type / third-party status; most requests stop here
+        resource_type = RESOURCE_TYPE_NAMES.get(info.resourceType(), "other")
+        source_host = info.firstPartyUrl().host().lower().rstrip('.')
+        third_party = is_third_party(host, source_host)
+        route = request_route(resource_type, third_party)
+        if route == ROUTE_HOST_ONLY:
+            return None
+        engine = self.filters if route == ROUTE_FULL else self.builtin_filters
+
+        # 3. Network filter rules (built-in YouTube/ad-query rules + EasyList)
+        key = None if url.hasQuery() else (host, url.path(), resource_type, source_host)
+        blocked = self.filter_decisions.get(key) if key is not None else None
+        if blocked is None:
+            url_str = url.toString().lower()
+            if raw_host != host:
+                url_str = url_str.replace(raw_host, host, 1)
+            blocked = engine.match(url_str, host, source_host, resource_type, third_party) is not None
+            if key is not None:
+                self.filter_decisions.put(key, blocked)
+        if blocked:
+            return "filters" if route == ROUTE_FULL else "builtin"
+        return None
+
+
+# Shared engines, one per profile. Every tab/window on a profile reuses the same
+# interceptor (and therefore the same parsed blocklist) instead of building its own.
+# It lives as long as the profile, not its views: the number of views drops to 0
+# in passing (pooled views, placeholder-only windows) and rebuilding would reload
+# every list. Maps id(profile) -> interceptor
+_shared_interceptors = {}
+# Loader/updater threads that outlived shutdown()'s wait, kept referenced until done
+_stopping_threads = set()
+
+def adblock_stats(profile):
+    """Stats snapshot of the profile's shared engine, or None if it isn't running."""
+    interceptor = _shared_interceptors.get(id(profile))
+    return interceptor.stats_snapshot() if interceptor else None
+
+def adblock_site_counts(profile):
+    """Requests/blocks per first-party site on the profile's shared engine ({} if not running)."""
+    interceptor = _shared_interceptors.get(id(profile))
+    return interceptor.stats.site_counts() if interceptor else {}
 
+def acquire_interceptor(profile):
+    """Returns the profile's shared AdBlockInterceptor, installing it on first use."""
+    interceptor = _shared_interceptors.get(id(profile))
+    if interceptor is None:
+        interceptor = AdBlockInterceptor()
+        profile.setUrlRequestInterceptor(interceptor)
+        _shared_interceptors[id(profile)] = interceptor
+        profile.destroyed.connect(partial(_drop_interceptor, id(profile)))
+    return interceptor
 
+def _drop_interceptor(key, *_):
+    interceptor = _shared_interceptors.pop(key, None)
+    if interceptor is not None:
+        interceptor.shutdown()
+        interceptor.deleteLater()
@@ -4,6 +4,11 @@ try:
     from openai import OpenAI
 except ImportError:
     OpenAI = None
+from browser.extraction import MAX_PAGE_TEXT_CHARS
+from browser.data_manager import DataManager
+
+# Pages from the user's own history offered to the model per query
+MAX_RELATED_PAGES = 3
 
 class AIAgent:
     def __init__(self, memory_manager):
@@ -31,6 +36,12 @@ class AIAgent:
         """
         self.controller = controller
 
+    def related_pages(self, query, context=None, limit=MAX_RELATED_PAGES):
+        """Best full-text matches for query in the history index, minus the current page."""
+        current_url = context.get('url') if context else None
+        results = DataManager().search_history(query, limit + 1, match_all=False)
+        return [r for r in results if r['url'] != current_url][:limit]
+
     def chat(self, user_message, context=None):
         """
         Process a user message with the given context (current page info).
@@ -114,9 +125,16 @@ Be concise."""
             page_context_str = f"\nCurrent Page Title: {context.get('title', 'Unknown')}\nCurrent URL: {context.get('url', 'Unknown')}\n"
             if context.get('text'):
                 # Truncate text to avoid token limits (NVIDIA Nim limits vary, safely assuming ~4k chars for now)
-                truncated_text = context['text'][:8000] 
+                truncated_text = context['text'][:MAX_PAGE_TEXT_CHARS]
                 page_context_str += f"Page Content (Truncated): {truncated_text}\n"
         
+        # Add pages from the user's browsing history that match the query
+        related = self.related_pages(user_message, context)
+        if related:
+            page_context_str += "\nRelated pages the user visited before (open with [[OPEN: url]] if useful):\n"
+            for page in related:
+                page_context_str += f"- {page['title'] or page['url']} ({page['url']}): {page['snippet']}\n"
+        
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": f"{page_context_str}\n\nUser Query: {user_message}"}
@@ -161,13 +179,16 @@ Be concise."""
         # We look for [[KEY: VALUE]]
         pattern = r"\[\[([A-Z]+):(.*?)\]\]" 
         matches = re.findall(pattern, response_text)
+        opened = 0
         
         for action, param in matches:
             param = param.strip()
             print(f"XeNit Agent Action: {action} -> {param}")
             
             if action == "OPEN":
-                self.controller.open_url(param)
+                # Only the first link takes focus, the rest wait as lazy background tabs
+                self.controller.open_url(param, background=opened > 0)
+                opened += 1
             elif action == "MUSIC":
                 self.controller.play_music(param)
             elif action == "WHATSAPP":
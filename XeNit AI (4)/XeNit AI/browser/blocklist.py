@@ -0,0 +1,215 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import urllib.error
+import urllib.request
+from bisect import bisect_left
+
+# Compiled blocklist format (little endian):
+#   header: magic, format version, source size, source mtime (ns), entry count
+#   body:   sorted array of unsigned 64-bit host hashes
+# The body is memory-mapped and binary searched in place, so arming the blocker
+# costs a file open instead of a full parse of the hosts text.
+MAGIC = b"XNBL"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sI3Q")
+
+class FetchInterrupted(Exception):
+    """The download was abandoned because should_stop() returned True."""
+
+def host_hash(host):
+    # Stable across runs (unlike hash()), 64 bits keeps collisions negligible at 100k+ hosts
+    return int.from_bytes(hashlib.blake2b(host.encode("utf-8"), digest_size=8).digest(), "little")
+
+def parse_hosts_line(line):
+    """Returns the blocked host from one hosts-file line, or None."""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    parts = line.split()
+    # Hosts format: 0.0.0.0 ad.doubleclick.net
+    if len(parts) >= 2 and (parts[0] == "0.0.0.0" or parts[0] == "127.0.0.1"):
+        return parts[1].lower()
+    # Raw domain list support just in case
+    if len(parts) == 1:
+        return parts[0].lower()
+    return None
+
+def domain_suffixes(host):
+    """Yields the host and each parent domain: a.b.example.com, b.example.com, example.com"""
+    # Trailing dot (FQDN form, e.g. the YouTube "dot trick") must not hide the match
+    labels = host.rstrip('.').split('.')
+    for i in range(len(labels) - 1):
+        yield '.'.join(labels[i:])
+
+def match_domain(host, domains):
+    """Returns the blocked domain covering host (itself or any parent), or None.
+
+    domains can be any container supporting `in` (a set or a CompiledBlocklist),
+    so a lookup costs one probe per label instead of a scan over the list.
+    """
+    for domain in domain_suffixes(host):
+        if domain in domains:
+            return domain
+    return None
+
+def _source_signature(source_path):
+    st = os.stat(source_path)
+    return st.st_size, st.st_mtime_ns
+
+def write_compiled(hashes, source_path, cache_path):
+    """Writes the compiled (sorted hash) form, stamped with the source file's signature.
+
+    Returns the path actually written: normally cache_path, or a side file when
+    the current cache can't be replaced because it is still mapped (Windows).
+    """
+    size, mtime = _source_signature(source_path)
+    ordered = sorted(hashes)
+
+    # Write to a temp file and swap it in, so a crash never leaves a torn cache
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, size, mtime, len(ordered)))
+        f.write(struct.pack(f"<{len(ordered)}Q", *ordered))
+    try:
+        os.replace(tmp_path, cache_path)
+        return cache_path
+    except PermissionError:
+        next_path = cache_path + ".next"
+        os.replace(tmp_path, next_path)
+        return next_path
+
+def compile_blocklist(source_path, cache_path):
+    """Parses the hosts text once and writes the compiled form. Returns the entry count."""
+    hashes = set()
+    with open(source_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            host = parse_hosts_line(line)
+            if host:
+                hashes.add(host_hash(host))
+    write_compiled(hashes, source_path, cache_path)
+    return len(hashes)
+
+def fetch_blocklist(url, source_path, meta_path, timeout=30, should_stop=None):
+    """Downloads the hosts list with a conditional GET, parsing it while it streams in.
+
+    ETag / Last-Modified from the previous download are kept in meta_path.
+    Returns the set of host hashes of the new list, or None if the server
+    reports it unchanged (HTTP 304). should_stop is polled once per line;
+    when it returns True the partial download is removed and FetchInterrupted
+    is raised.
+    """
+    meta = {}
+    if os.path.exists(meta_path) and os.path.exists(source_path):
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+
+    # Set a proper User-Agent to avoid 403 Forbidden from GitHub
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    if meta.get("etag"):
+        headers['If-None-Match'] = meta["etag"]
+    if meta.get("last_modified"):
+        headers['If-Modified-Since'] = meta["last_modified"]
+    req = urllib.request.Request(url, headers=headers)
+
+    hashes = set()
+    part_path = source_path + ".part"
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response, open(part_path, 'wb') as out:
+            for raw in response:
+                if should_stop is not None and should_stop():
+                    raise FetchInterrupted()
+                out.write(raw)
+                host = parse_hosts_line(raw.decode('utf-8', errors='ignore'))
+                if host:
+                    hashes.add(host_hash(host))
+            new_meta = {
+                "etag": response.headers.get('ETag'),
+                "last_modified": response.headers.get('Last-Modified'),
+            }
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None
+        raise
+    except FetchInterrupted:
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+        raise
+
+    # Save for offline use only once the whole list arrived
+    os.replace(part_path, source_path)
+    with open(meta_path, 'w') as f:
+        json.dump(new_meta, f)
+    return hashes
+
+def _cache_is_fresh(source_path, cache_path):
+    if not os.path.exists(cache_path):
+        return False
+    try:
+        with open(cache_path, 'rb') as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return False
+        magic, version, size, mtime, _count = HEADER.unpack(header)
+        return (magic == MAGIC and version == FORMAT_VERSION
+                and (size, mtime) == _source_signature(source_path))
+    except (OSError, struct.error):
+        return False
+
+class CompiledBlocklist:
+    """Read-only, memory-mapped view over a compiled blocklist file."""
+
+    def __init__(self, cache_path):
+        self.path = cache_path
+        self._file = open(cache_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _size, _mtime, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Not a compiled blocklist: {cache_path}")
+        self._view = memoryview(self._map)
+        self._hashes = self._view[HEADER.size:HEADER.size + count * 8].cast('Q')
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def hashes(self):
+        return set(self._hashes)
+
+    def __contains__(self, host):
+        h = host_hash(host)
+        i = bisect_left(self._hashes, h)
+        return i < len(self._hashes) and self._hashes[i] == h
+
+    def close(self):
+        for view in (getattr(self, '_hashes', None), getattr(self, '_view', None)):
+            if view is not None:
+                view.release()
+        self._hashes = self._view = None
+        self._map.close()
+        self._file.close()
+
+def load_blocklist(source_path, cache_path):
+    """Opens the compiled cache, rebuilding it first if the source list changed."""
+    # A refresh that couldn't replace the mapped cache last run left it beside it;
+    # nothing is mapped yet, so move it into place (it is checked like any cache)
+    next_path = cache_path + ".next"
+    if os.path.exists(next_path):
+        try:
+            os.replace(next_path, cache_path)
+        except OSError:
+            try:
+                os.remove(next_path)
+            except OSError:
+                pass
+    if not _cache_is_fresh(source_path, cache_path):
+        count = compile_blocklist(source_path, cache_path)
+        print(f"XeNit AdBlock: Compiled {count} hosts -> {cache_path}")
+    return CompiledBlocklist(cache_path)
@@ -1,6 +1,9 @@
 import json
 import os
 from datetime import datetime
+from browser.history_store import HistoryStore
+from browser.persistence import WriteBehind
+from browser.search_index import SearchIndex
 
 class DataManager:
     _instance = None
@@ -16,51 +19,91 @@ class DataManager:
         if not os.path.exists(self.base_dir):
             os.makedirs(self.base_dir)
             
-        self.history_file = os.path.join(self.base_dir, "history.json")
+        self.history_file = os.path.join(self.base_dir, "history.json")  # pre-SQLite, migrated once
+        self.history_db_file = os.path.join(self.base_dir, "history.db")
         self.bookmarks_file = os.path.join(self.base_dir, "bookmarks.json")
+        self.settings_file = os.path.join(self.base_dir, "settings.json")
         
-        self.history = self.load_json(self.history_file)
+        self.history_store = HistoryStore(self.history_db_file)
+        self.history_store.migrate_json(self.history_file)
+        latest = self.history_store.latest()
+        self._last_history_url = latest["url"] if latest else None
+        # Full-text index over visited pages, in the same database
+        self.search_index = SearchIndex(self.history_db_file)
         self.bookmarks = self.load_json(self.bookmarks_file)
+        self.settings = self.load_json(self.settings_file, default={})
+        self.listeners = []  # callback(kind, item), kind: "visit" / "bookmark" / "clear"
 
-    def load_json(self, filepath):
+    def load_json(self, filepath, default=None):
+        if default is None:
+            default = []
         if os.path.exists(filepath):
             try:
                 with open(filepath, 'r') as f:
                     return json.load(f)
             except:
-                return []
-        return []
+                return default
+        return default
+
+    def add_listener(self, callback):
+        """callback(kind, item) runs after every new visit, bookmark or history clear."""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def _notify(self, kind, item=None):
+        for callback in list(self.listeners):
+            callback(kind, item)
 
     def save_json(self, data, filepath):
-        try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=4)
-        except Exception as e:
-            print(f"Error saving {filepath}: {e}")
+        # Written atomically on the persistence thread, coalesced with other changes
+        WriteBehind().schedule(filepath, data, indent=4)
 
     def add_history_item(self, title, url):
         # Avoid duplicates for the very last item or spam
-        if self.history and self.history[0]['url'] == url:
+        if url == self._last_history_url:
             return
-            
-        item = {
-            "title": title,
-            "url": url,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.history.insert(0, item)
-        # Keep only last 1000 items
-        if len(self.history) > 1000:
-            self.history = self.history[:1000]
-        self.save_json(self.history, self.history_file)
+        self._last_history_url = url
+        timestamp = datetime.now().isoformat()
+        self.history_store.add(title, url, timestamp)
+        self.search_index.index_visit(url, title, timestamp)
+        self._notify("visit", {"title": title, "url": url, "timestamp": timestamp})
 
     def add_bookmark(self, title, url):
         item = {"title": title, "url": url}
         self.bookmarks.append(item)
         self.save_json(self.bookmarks, self.bookmarks_file)
+        self._notify("bookmark", item)
         
-    def get_history(self):
-        return self.history
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+    def set_setting(self, key, value):
+        self.settings[key] = value
+        self.save_json(self.settings, self.settings_file)
+
+    def get_history(self, limit=None, offset=0):
+        """History items newest first (all of them unless limit is given)."""
+        return self.history_store.recent(limit, offset)
+
+    def get_history_page(self, before_id=None, limit=200):
+        """One page of history items (with their "id") older than before_id, newest first."""
+        return self.history_store.page(before_id, limit)
+
+    def history_count(self):
+        return self.history_store.count()
+
+    def clear_history(self):
+        self.history_store.clear()
+        self.search_index.clear()
+        self._last_history_url = None
+        self._notify("clear")
+
+    def search_history(self, query, limit=50, match_all=True):
+        """Visited pages matching query (title, URL or page text), best first."""
+        return self.search_index.search(query, limit, match_all)
         
     def get_bookmarks(self):
         return self.bookmarks
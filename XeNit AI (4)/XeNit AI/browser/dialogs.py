@@ -1,7 +1,12 @@
-from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QListWidget, QListWidgetItem, 
-                             QPushButton, QLineEdit, QCheckBox, QComboBox, QFormLayout, QWidget)
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QListWidget, QListView,
+                             QPushButton, QLineEdit, QCheckBox, QComboBox, QFormLayout, QWidget,
+                             QTableWidget, QTableWidgetItem, QHBoxLayout, QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import Qt, QSize, QTimer
+import os
+import signal
 from browser.data_manager import DataManager
+from browser.history_model import HistoryListModel, BookmarkListModel
+from browser.performance import PROFILES, SETTING_KEY, DEFAULT_PROFILE, active_profile
 
 class BaseDialog(QDialog):
     def __init__(self, title, parent=None):
@@ -15,18 +20,18 @@ class BaseDialog(QDialog):
                 color: #FAFAFA;
             }
             QLabel { color: #FAFAFA; font-size: 14px; }
-            QListWidget {
+            QListView {
                 background-color: #18181b;
                 border: 1px solid #27272a;
                 border-radius: 8px;
                 color: #A1A1AA;
                 padding: 5px;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 10px;
                 border-bottom: 1px solid #27272a;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: rgba(0, 240, 255, 0.1);
                 color: #00F0FF;
             }
@@ -52,69 +57,64 @@ class BaseDialog(QDialog):
         """)
         self.layout = QVBoxLayout(self)
 
+    def make_list_view(self, model):
+        """A QListView over a paged model; double-click calls open_url(index)."""
+        view = QListView()
+        view.setModel(model)
+        view.setUniformItemSizes(True)
+        view.doubleClicked.connect(self.open_url)
+        self.layout.addWidget(view)
+        return view
+
+    def open_url(self, index):
+        url = index.data(Qt.ItemDataRole.UserRole)
+        if url and hasattr(self.parent(), 'add_new_tab'):
+            from PyQt6.QtCore import QUrl
+            self.parent().add_new_tab(QUrl(url), "New Tab")
+            self.close()
+
 class HistoryDialog(BaseDialog):
     def __init__(self, parent=None):
         super().__init__("History", parent)
         self.data_manager = DataManager()
+        # The model listens for new visits; don't keep it around hidden after closing
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         
-        self.list_widget = QListWidget()
-        self.layout.addWidget(self.list_widget)
-        
-        self.load_history()
+        # Full-text search over titles, URLs and page text (runs after a short typing pause)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search history and page content...")
+        self.search_box.setClearButtonEnabled(True)
+        self.layout.addWidget(self.search_box)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.load_history)
+        self.search_box.textChanged.connect(lambda _: self.search_timer.start())
         
-        self.list_widget.itemDoubleClicked.connect(self.open_url)
+        # Paged from history.db as the list scrolls, never the whole history at once
+        self.model = HistoryListModel(self)
+        self.list_view = self.make_list_view(self.model)
         
         btn = QPushButton("Clear History")
         btn.clicked.connect(self.clear_history)
         self.layout.addWidget(btn)
 
     def load_history(self):
-        self.list_widget.clear()
-        for item in self.data_manager.get_history():
-            # item = {title, url, timestamp}
-            display_text = f"{item.get('title', 'No Title')}\n{item.get('url', '')}"
-            list_item = QListWidgetItem(display_text)
-            list_item.setData(Qt.ItemDataRole.UserRole, item.get('url'))
-            self.list_widget.addItem(list_item)
-
-    def open_url(self, item):
-        url = item.data(Qt.ItemDataRole.UserRole)
-        if hasattr(self.parent(), 'add_new_tab'):
-            from PyQt6.QtCore import QUrl
-            self.parent().add_new_tab(QUrl(url), "New Tab")
-            self.close()
+        self.model.set_query(self.search_box.text())
+        self.list_view.scrollToTop()
 
     def clear_history(self):
-        self.data_manager.history = []
-        self.data_manager.save_json([], self.data_manager.history_file)
-        self.load_history()
+        # The model resets itself on the "clear" notification
+        self.data_manager.clear_history()
 
 class BookmarksDialog(BaseDialog):
     def __init__(self, parent=None):
         super().__init__("Bookmarks", parent)
         self.data_manager = DataManager()
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         
-        self.list_widget = QListWidget()
-        self.layout.addWidget(self.list_widget)
-        
-        self.load_bookmarks()
-        
-        self.list_widget.itemDoubleClicked.connect(self.open_url)
-
-    def load_bookmarks(self):
-        self.list_widget.clear()
-        for item in self.data_manager.get_bookmarks():
-            display_text = f"{item.get('title', 'No Title')}\n{item.get('url', '')}"
-            list_item = QListWidgetItem(display_text)
-            list_item.setData(Qt.ItemDataRole.UserRole, item.get('url'))
-            self.list_widget.addItem(list_item)
-
-    def open_url(self, item):
-        url = item.data(Qt.ItemDataRole.UserRole)
-        if hasattr(self.parent(), 'add_new_tab'):
-            from PyQt6.QtCore import QUrl
-            self.parent().add_new_tab(QUrl(url), "New Tab")
-            self.close()
+        self.model = BookmarkListModel(self)
+        self.list_view = self.make_list_view(self.model)
 
 class DownloadsDialog(BaseDialog):
     def __init__(self, parent=None):
@@ -146,14 +146,179 @@ class SettingsDialog(BaseDialog):
         self.search_engine.addItems(["Google", "DuckDuckGo", "Bing", "Brave Search"])
         form_layout.addRow("Search Engine:", self.search_engine)
         
+        # Chromium performance profile (applied at startup)
+        self.data_manager = DataManager()
+        self.perf_profile = QComboBox()
+        for name, profile in PROFILES.items():
+            self.perf_profile.addItem(profile["label"], name)
+        saved = self.data_manager.get_setting(SETTING_KEY, DEFAULT_PROFILE)
+        self.perf_profile.setCurrentIndex(max(0, self.perf_profile.findData(saved)))
+        form_layout.addRow("Performance:", self.perf_profile)
+        
+        self.perf_note = QLabel()
+        self.perf_note.setWordWrap(True)
+        self.perf_note.setStyleSheet("color: #A1A1AA; font-size: 12px;")
+        form_layout.addRow("", self.perf_note)
+        self.perf_profile.currentIndexChanged.connect(self.update_perf_note)
+        self.update_perf_note()
+        
         container = QWidget()
         container.setLayout(form_layout)
         self.layout.addWidget(container)
         
         save_btn = QPushButton("Save Settings")
-        save_btn.clicked.connect(self.accept)
+        save_btn.clicked.connect(self.save_settings)
         self.layout.addWidget(save_btn)
 
+    def update_perf_note(self):
+        name = self.perf_profile.currentData()
+        note = PROFILES[name]["description"]
+        if name != active_profile():
+            note += " Takes effect after a restart."
+        self.perf_note.setText(note)
+
+    def save_settings(self):
+        self.data_manager.set_setting(SETTING_KEY, self.perf_profile.currentData())
+        self.accept()
+
+class TaskManagerDialog(BaseDialog):
+    # Request counts are per site, the interceptor doesn't know which tab asked
+    COLUMNS = ["Tab", "Site", "State", "CPU %", "Memory (MB)", "Network (KB)",
+               "Site Requests", "Site Blocked", "PID"]
+
+    def __init__(self, monitor, lifecycle, parent=None):
+        super().__init__("Task Manager", parent)
+        self.resize(860, 480)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.monitor = monitor
+        self.lifecycle = lifecycle
+        
+        self.group_by = QComboBox()
+        self.group_by.addItems(["By tab", "By site"])
+        self.group_by.currentIndexChanged.connect(self.refresh)
+        self.layout.addWidget(self.group_by)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSortingEnabled(True)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.sortByColumn(4, Qt.SortOrder.DescendingOrder)
+        self.table.setStyleSheet("""
+            QTableWidget {
+                background-color: #18181b;
+                border: 1px solid #27272a;
+                border-radius: 8px;
+                color: #A1A1AA;
+                gridline-color: #27272a;
+            }
+            QTableWidget::item:selected {
+                background-color: rgba(0, 240, 255, 0.1);
+                color: #00F0FF;
+            }
+            QHeaderView::section {
+                background-color: #09090b;
+                color: #FAFAFA;
+                border: none;
+                border-bottom: 1px solid #27272a;
+                padding: 6px;
+            }
+        """)
+        self.layout.addWidget(self.table)
+        
+        buttons = QHBoxLayout()
+        discard_btn = QPushButton("Discard Tab")
+        discard_btn.clicked.connect(self.discard_selected)
+        kill_btn = QPushButton("End Process")
+        kill_btn.clicked.connect(self.end_selected_process)
+        buttons.addWidget(discard_btn)
+        buttons.addWidget(kill_btn)
+        self.layout.addLayout(buttons)
+        
+        # The monitor only samples while a task manager is open
+        self.monitor.sampled.connect(self.refresh)
+        self.monitor.add_viewer()
+
+    def done(self, result):
+        if self.monitor is not None:
+            self.monitor.sampled.disconnect(self.refresh)
+            self.monitor.remove_viewer()
+            self.monitor = None
+        super().done(result)
+
+    def current_rows(self):
+        if self.group_by.currentIndex() == 1:
+            return self.monitor.site_rows()
+        return self.monitor.rows
+
+    def row_key(self, row):
+        # The site when grouped by site, else the tab itself: titles change and repeat
+        if self.group_by.currentIndex() == 1:
+            return row["site"]
+        return row["views"][0] if row["views"] else None
+
+    def refresh(self):
+        selected = self.selected_row()
+        selected_key = self.row_key(selected) if selected else None
+        
+        # Refill with sorting off, otherwise rows jump while being filled
+        self.table.setSortingEnabled(False)
+        rows = self.current_rows()
+        self.table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            values = [
+                row["title"], row["site"], row["state"],
+                round(row["cpu"], 1), round(row["rss"] / (1024 * 1024), 1),
+                round(row["bytes"] / 1024, 1), row["requests"], row["blocked"], row["pid"],
+            ]
+            for c, value in enumerate(values):
+                item = QTableWidgetItem()
+                # Numbers as data, not text, so columns sort numerically
+                item.setData(Qt.ItemDataRole.DisplayRole, value)
+                if c == 0:
+                    item.setData(Qt.ItemDataRole.UserRole, row)
+                self.table.setItem(r, c, item)
+        self.table.setSortingEnabled(True)
+        
+        if selected_key is not None:
+            for r in range(self.table.rowCount()):
+                if self.row_key(self.table.item(r, 0).data(Qt.ItemDataRole.UserRole)) == selected_key:
+                    self.table.selectRow(r)
+                    break
+
+    def selected_row(self):
+        items = self.table.selectedItems()
+        if not items:
+            return None
+        return self.table.item(items[0].row(), 0).data(Qt.ItemDataRole.UserRole)
+
+    def discard_selected(self):
+        row = self.selected_row()
+        if not row:
+            return
+        for view in row["views"]:
+            if hasattr(view, 'page'):
+                self.lifecycle.discard(view)
+        self.monitor.sample()
+
+    def end_selected_process(self):
+        row = self.selected_row()
+        if not row:
+            return
+        # Renderers can be shared: every tab in that process goes down with it
+        pids = {view.page().renderProcessPid() for view in row["views"] if hasattr(view, 'page')}
+        for pid in pids:
+            if pid:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                    print(f"XeNit Task Manager: Ended renderer process {pid}")
+                except OSError as e:
+                    print(f"XeNit Task Manager: Could not end process {pid}: {e}")
+        self.monitor.sample()
+
 class HelpDialog(BaseDialog):
     def __init__(self, parent=None):
         super().__init__("Help / About", parent)
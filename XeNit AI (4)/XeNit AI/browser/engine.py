@@ -1,16 +1,53 @@
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineSettings, QWebEngineScript
-from PyQt6.QtCore import QUrl
-from browser.adblock import AdBlockInterceptor
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineSettings
+import json
+from PyQt6.QtCore import QUrl, QTimer
+from browser.adblock import acquire_interceptor
+from browser.governor import memory_governor, LEVEL_TRIM
+from browser.performance import active_settings
+from browser.data_manager import DataManager
+from browser.extraction import PAGE_TEXT_CACHE, PageTextExtraction
+from browser.pages import get_new_tab_html, get_adblock_stats_html, get_adblock_stats_body
+from browser.scripts import install_shield_scripts
+from browser.session import merge_history, step_history
 
 class WebView(QWebEngineView):
+    # Quiet period after loadFinished before text extraction runs
+    EXTRACT_IDLE_MS = 1500
+    # How often an open xenit://adblock page gets fresh numbers
+    ADBLOCK_REFRESH_MS = 2000
+
     def __init__(self, tab_index, parent=None):
         super().__init__(parent)
         self.tab_index = tab_index
         self.parent_window = parent # Reference to BrowserWindow or TabManager
-        self.last_extracted_text = ""
         
-        self.loadFinished.connect(self.extract_page_text)
+        # Page text for the agent: extracted once the visible tab goes idle after
+        # a load (or on demand), never for every background load
+        self._extraction = None
+        self._extraction_callbacks = []
+        self._extract_timer = QTimer(self)
+        self._extract_timer.setSingleShot(True)
+        self._extract_timer.setInterval(self.EXTRACT_IDLE_MS)
+        self._extract_timer.timeout.connect(self.extract_page_text)
+        self._load_finished = False
+        self.loadStarted.connect(self._on_load_started)
+        self.loadFinished.connect(self._on_load_finished)
+        
+        # Session restore: back/forward entries from the previous run that
+        # Chromium's own history doesn't know about, [url, title] pairs
+        self.session_back = []
+        self.session_forward = []
+        # Chromium entries below this index are leftovers of a step into the
+        # restored entries (also held in the session lists), never visited again
+        self.history_floor = 0
+        self._restore_scroll = None
+        # URL handed to the load scheduler; url() stays empty while it is queued
+        self.pending_url = QUrl()
+        # xenit://adblock is rendered once, then its numbers are pushed in place
+        self._stats_timer = QTimer(self)
+        self._stats_timer.setInterval(self.ADBLOCK_REFRESH_MS)
+        self._stats_timer.timeout.connect(self._refresh_adblock_stats)
         
         # Setup Profile and Settings
         self.profile = QWebEngineProfile.defaultProfile()
@@ -39,233 +76,15 @@ class WebView(QWebEngineView):
         # We can't set command line args here easily per-view, 
         # but we ensure the profile uses system http cache
         self.profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+        self.profile.setHttpCacheMaximumSize(active_settings()["http_cache_mb"] * 1024 * 1024)
         self.profile.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies)
         
-        # AdBlock
-        self.interceptor = AdBlockInterceptor(self)
-        self.profile.setUrlRequestInterceptor(self.interceptor)
-        
-        # 1. EARLY SHIELD (DocumentCreation)
-        # Prevents popups and injects CSS rules before page renders fully
-        # ALSO: Spoofs navigator behavior to look like a real browser (not automation)
-        
-        # CSS Code for Cosmetic Filtering
-        css_code = """
-        /* Generic Ad Hiding Rules */
-        div[id^="google_ads_"], div[id*="google_ads_"],
-        iframe[id^="google_ads_"], iframe[id*="google_ads_"],
-        iframe[src*="doubleclick.net"], iframe[src*="googlesyndication.com"],
-        .adsbygoogle, .google-auto-placed, .ad-banner, .banner-ad,
-        .ad_unit, .ad-slot, .ad-wrapper, .ad-container,
-        .text-ad, .sponsor-ad, .sponsored-link,
-        a[href*="/ad/"], a[href*="doubleclick"],
-        div[data-ad-unit], div[data-google-query-id] {
-            display: none !important;
-            visibility: hidden !important;
-            height: 0 !important;
-            width: 0 !important;
-            pointer-events: none !important;
-        }
-        """
-        
-        early_shield_js = f"""
-        (function() {{
-            try {{
-                // 0. JSON INTERCEPTION (The "Forceful" Fix)
-                // YouTube delivers ad configurations in JSON blobs. We strip them out before the player sees them.
-                const originalParse = JSON.parse;
-                JSON.parse = function(text, reviver) {{
-                    const data = originalParse(text, reviver);
-                    if (data && typeof data === 'object') {{
-                        // YouTube Ad Keys
-                        if (data.adPlacements) {{
-                            delete data.adPlacements;
-                            console.log('XeNit AdBlock: Stripped adPlacements');
-                        }}
-                        if (data.playerAds) {{
-                            delete data.playerAds;
-                            console.log('XeNit AdBlock: Stripped playerAds');
-                        }}
-                    }}
-                    return data;
-                }};
-                
-                // 1. Strict Popup Blocker (Immediate)
-                window.open = function(url, target, features) {{
-                    console.log('XeNit AdBlock: Blocked Popup to ' + url);
-                    return null;
-                }};
-                
-                // 2. STEALTH MODE: Anti-Detection Evasions
-                
-                // A. Hide Webdriver (The biggest flag)
-                Object.defineProperty(navigator, 'webdriver', {{
-                    get: () => undefined
-                }});
-                
-                // B. Mock window.chrome (Required for Google Login)
-                if (!window.chrome) {{
-                    window.chrome = {{
-                        runtime: {{}},
-                        loadTimes: function() {{}},
-                        csi: function() {{}},
-                        app: {{}}
-                    }};
-                }}
-                
-                // C. Mock Plugins (Empty plugins array triggers bots)
-                if (navigator.plugins.length === 0) {{
-                    Object.defineProperty(navigator, 'plugins', {{
-                        get: () => [1, 2, 3, 4, 5] // Dummy length to fool checks
-                    }});
-                }}
-                
-                // D. Mock Languages
-                Object.defineProperty(navigator, 'languages', {{
-                    get: () => ['en-US', 'en']
-                }});
-                
-                // E. Mock Permissions (Passes notification checks)
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                    Promise.resolve({{ state: Notification.permission }}) :
-                    originalQuery(parameters)
-                );
-                
-                console.log('XeNit Stealth Mode: Active');
-                
-            }} catch (e) {{
-                console.log('XeNit Stealth Error: ' + e);
-            }}
-        }})();
-        """
-        
-        script_early = QWebEngineScript()
-        script_early.setName("XeNitShieldStart")
-        script_early.setSourceCode(early_shield_js)
-        script_early.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
-        script_early.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld)
-        self.profile.scripts().insert(script_early)
-        
-        # 2. LATE SHIELD (DocumentReady)
-        # Injects CSS and cleans up elements
-        late_shield_js = f"""
-        (function() {{
-            // 1. Cosmetic CSS Injection
-            const style = document.createElement('style');
-            style.type = 'text/css';
-            style.textContent = `{css_code}`; 
-            (document.head || document.documentElement).appendChild(style);
-            
-            // 2. AGGRESSIVE YOUTUBE CLEANER
-            function cleanYouTube() {{
-                const player = document.querySelector('#movie_player');
-                const video = document.querySelector('video');
-                
-                // A. Skip Buttons (Click immediately)
-                const skipBtn = document.querySelector('.ytp-ad-skip-button, .ytp-ad-skip-button-modern, .videoAdUiSkipButton');
-                if (skipBtn) {{
-                    skipBtn.click();
-                    console.log('XeNit AdBlock: Skipped Ad (Click)');
-                }}
-                
-                // B. Overlay Ads (Remove)
-                const overlays = document.querySelectorAll('.ytp-ad-overlay-container, .ytp-ad-image-overlay, .ytp-ad-module');
-                overlays.forEach(overlay => {{
-                    overlay.style.display = 'none';
-                    // Don't remove module, it might hold the skip button logic
-                    if (!overlay.classList.contains('ytp-ad-module')) overlay.remove();
-                }});
-                
-                // Force Autoplay Next (User Request "Activate Autopay")
-                const autoNav = document.querySelector('.ytp-autonav-toggle-button[aria-checked="false"]');
-                if (autoNav) {{
-                    autoNav.click();
-                    console.log('XeNit: Enabled Autoplay Next');
-                }}
-                
-                // Auto-Close Consent Popups (if any)
-                const consent = document.querySelector('button[aria-label^="Accept"]');
-                if (consent) consent.click();
-
-                // 3. CAPTCHA AUTO-SOLVER (Simple Checkboxes)
-                function cleanCaptcha() {{
-                    // Cloudflare Turnstile / Challenge
-                    const cfBox = document.querySelector('#challenge-stage input[type="checkbox"]');
-                    if (cfBox && !cfBox.checked) {{
-                        cfBox.click();
-                        console.log("XeNit: Clicked Cloudflare Checkbox");
-                    }}
-                    
-                    // Generic "I am human" buttons (careful selector)
-                    const challenge = document.querySelector('#turnstile-wrapper iframe') || document.querySelector('.cf-turnstile iframe');
-                    if (challenge) {{
-                        // We can't click INSIDE an iframe easily without logic in that frame.
-                    }}
-                }}
-                cleanCaptcha();
-
-                // C. Video Ads (Speed Up & Mute & Seek)
-                // Check multiple indicators
-                const adShowing = document.querySelector('.ad-showing, .job-ad-showing');
-                const isInterrupting = player && player.classList.contains('ad-interrupting');
-                
-                if (video && (adShowing || isInterrupting)) {{
-                    video.muted = true;
-                    video.playbackRate = 16.0; // Fast forward
-                    // Force seek to end
-                    if (!isNaN(video.duration)) {{
-                         video.currentTime = video.duration;
-                    }}
-                    console.log('XeNit AdBlock: Fast-Forwarding/Seeking Ad');
-                    
-                    // Force click skip if available inside the ad container
-                    const innerSkip = document.querySelector('.ytp-ad-skip-button-slot');
-                    if (innerSkip) innerSkip.click();
-                }} else if (video && video.paused && !adShowing && !isInterrupting) {{
-                    // Force play main video if it's paused at the start (and not an ad)
-                    // We check if it's the main video by ensuring no ad UI is present
-                    if (video.currentTime < 2) {{
-                         video.play();
-                         console.log('XeNit: Force Playing Video');
-                    }}
-                }}
-                
-                // D. Static Ad Containers
-                const adSelectors = [
-                    'ytd-promoted-sparkles-web-renderer', 'ytd-display-ad-renderer', 
-                    'ytd-statement-banner-renderer', 'ytd-in-feed-ad-layout-renderer',
-                    '#masthead-ad', 'ytd-banner-promo-renderer', '#player-ads',
-                    '.ytd-merch-shelf-renderer', 'ytd-ad-slot-renderer',
-                    'ytd-player-legacy-desktop-watch-ads-renderer',
-                    'ytd-rich-item-renderer.ytd-ad-slot-renderer'
-                ];
-                adSelectors.forEach(sel => {{
-                    document.querySelectorAll(sel).forEach(el => {{
-                        el.style.display = 'none';
-                        el.remove();
-                    }});
-                }});
-            }}
-            
-            // Run loop (Balanced: 300ms)
-            setInterval(cleanYouTube, 300); 
-            
-            // Also use MutationObserver for immediate reaction
-            const observer = new MutationObserver(cleanYouTube);
-            observer.observe(document.body, {{ childList: true, subtree: true }});
-            
-            console.log('XeNit AdBlock: Aggressive Sweeper Active');
-        }})();
-        """
+        # AdBlock (shared per profile, loaded once for all its tabs/windows)
+        self.interceptor = acquire_interceptor(self.profile)
+        memory_governor().register("adblock caches", self.interceptor.shrink, LEVEL_TRIM, owner=self.interceptor)
         
-        script_late = QWebEngineScript()
-        script_late.setName("XeNitShieldEnd")
-        script_late.setSourceCode(late_shield_js)
-        script_late.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentReady)
-        script_late.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld)
-        self.profile.scripts().insert(script_late)
+        # Shield scripts (installed once per profile, YouTube cleanup only on YouTube)
+        install_shield_scripts(self.profile)
 
     def createWindow(self, type):
         # BLOCK OFFENSIVE POPUPS
@@ -283,10 +102,105 @@ class WebView(QWebEngineView):
                 return new_view
         return super().createWindow(type)
 
-    def extract_page_text(self):
-        # Run JS to get body text
-        self.page().runJavaScript("document.body.innerText", self._store_text_callback)
+    def load_internal(self, qurl):
+        """Renders a built-in xenit:// page (new tab, adblock stats) into this view."""
+        if qurl.host() == "adblock":
+            self.setHtml(get_adblock_stats_html(self.interceptor.stats_snapshot()), QUrl("xenit://adblock"))
+            self._stats_timer.start()
+        else:
+            self.setHtml(get_new_tab_html(), QUrl("xenit://newtab"))
+
+    def _refresh_adblock_stats(self):
+        if self.url() != QUrl("xenit://adblock"):
+            self._stats_timer.stop()  # navigated away
+            return
+        if not self.isVisible():
+            return  # nobody is looking, keep the timer for when the tab is shown
+        body = json.dumps(get_adblock_stats_body(self.interceptor.stats_snapshot()))
+        self.page().runJavaScript(
+            f"(function(el) {{ if (el) el.innerHTML = {body}; }})(document.getElementById('stats'));")
+
+    def restore_session(self, record):
+        """Applies a saved tab record (see browser.session): back/forward entries and scroll offset."""
+        self.session_back = [list(e) for e in record.get("back", [])]
+        self.session_forward = [list(e) for e in record.get("forward", [])]
+        scroll = record.get("scroll") or [0, 0]
+        if scroll[0] or scroll[1]:
+            self._restore_scroll = scroll
+            self.loadFinished.connect(self._apply_restored_scroll)
+
+    def _apply_restored_scroll(self, ok):
+        self.loadFinished.disconnect(self._apply_restored_scroll)
+        if ok and self._restore_scroll:
+            x, y = self._restore_scroll
+            self.page().runJavaScript(f"window.scrollTo({int(x)}, {int(y)});")
+        self._restore_scroll = None
+
+    def go_back(self):
+        if self.history().currentItemIndex() > self.history_floor:
+            self.back()
+        elif self.session_back:
+            self._step_session(-1)
+
+    def go_forward(self):
+        if self.history().canGoForward():
+            self.forward()
+        elif self.session_forward:
+            self._step_session(1)
+
+    def _step_session(self, direction):
+        # Moving into restored entries: the Python lists become the whole
+        # back/forward stack and Chromium's history restarts from the target
+        history = self.history()
+        entries = [[i.url().toString(), i.title()] for i in history.items()]
+        index = history.currentItemIndex()
+        back, forward = merge_history(entries, index, self.history_floor,
+                                      self.session_back, self.session_forward)
+        current = entries[index] if 0 <= index < len(entries) else [self.url().toString(), self.title()]
+        target, self.session_back, self.session_forward = step_history(back, current, forward, direction)
+        history.clear()
+        # clear() keeps the current entry; it stays below the floor
+        self.history_floor = history.count()
+        self.setUrl(QUrl(target[0]))
+
+    @property
+    def last_extracted_text(self):
+        """Main text of the current page from the shared cache ("" until extracted)."""
+        return PAGE_TEXT_CACHE.get(self.url().toString()) or ""
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # A background tab that finished loading unseen gets extracted once shown;
+        # one still loading is picked up by its own loadFinished
+        if self._load_finished and not self.last_extracted_text:
+            self._schedule_extraction(True)
+
+    def _on_load_started(self):
+        self._load_finished = False
+        self._extract_timer.stop()
+
+    def _on_load_finished(self, ok):
+        self._load_finished = ok
+        self._schedule_extraction(ok)
+
+    def _schedule_extraction(self, ok=True):
+        if ok and self.isVisible() and self.url().scheme() in ("http", "https", "file"):
+            self._extract_timer.start()
+
+    def extract_page_text(self, callback=None):
+        """Extracts the page's main text into PAGE_TEXT_CACHE; callback(text) gets the result."""
+        if callback is not None:
+            self._extraction_callbacks.append(callback)
+        if self._extraction is not None:
+            return  # already streaming, callback joins it
+        self._extraction = PageTextExtraction(self.page(), self.url().toString(), self._extraction_done)
+        self._extraction.start()
 
-    def _store_text_callback(self, result):
-        if isinstance(result, str):
-            self.last_extracted_text = result
+    def _extraction_done(self, text):
+        if text:
+            # Searchable later from history and by the agent
+            DataManager().search_index.index_text(self._extraction.url, self.title(), text)
+        self._extraction = None
+        callbacks, self._extraction_callbacks = self._extraction_callbacks, []
+        for callback in callbacks:
+            callback(text or "")
@@ -0,0 +1,161 @@
+import hashlib
+from collections import OrderedDict
+from PyQt6.QtWebEngineCore import QWebEngineScript
+from browser.governor import LEVEL_DROP_TEXT
+
+# The agent only ever reads this much page text (see AIAgent.chat)
+MAX_PAGE_TEXT_CHARS = 8000
+# Text crosses the IPC bridge in pieces this big
+CHUNK_CHARS = 2000
+# Total characters kept across all pages/tabs
+CACHE_BUDGET_CHARS = 2_000_000
+
+# Readability-style extraction, run inside the page.
+# Picks the main content root (article/main, else the container holding the
+# most paragraph text), walks its text nodes skipping boilerplate, and stops as
+# soon as max_chars is reached, so huge pages cost no more than small ones.
+# Runs in the application world: the page's own scripts can't see or overwrite
+# the text kept on window between chunks, or patch the DOM APIs used here.
+EXTRACT_JS = """
+(function(offset, chunkSize, maxChars) {
+    if (offset === 0 || typeof window.__xenitPageText !== 'string') {
+        const SKIP = {SCRIPT: 1, STYLE: 1, NOSCRIPT: 1, NAV: 1, HEADER: 1, FOOTER: 1,
+                      ASIDE: 1, FORM: 1, SVG: 1, IFRAME: 1, BUTTON: 1, TEMPLATE: 1};
+
+        function pickRoot() {
+            const explicit = document.querySelector('article, main, [role="main"]');
+            if (explicit) return explicit;
+            // Score containers by the paragraph text they directly hold
+            const scores = new Map();
+            let best = null, bestScore = 0;
+            const paragraphs = document.querySelectorAll('p');
+            for (let i = 0; i < paragraphs.length && i < 300; i++) {
+                const parent = paragraphs[i].parentElement;
+                if (!parent) continue;
+                const score = (scores.get(parent) || 0) + paragraphs[i].textContent.length;
+                scores.set(parent, score);
+                if (score > bestScore) { best = parent; bestScore = score; }
+            }
+            return (best && bestScore > 500) ? best : document.body;
+        }
+
+        const root = pickRoot();
+        let text = '';
+        if (root) {
+            const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT, {
+                acceptNode: function(node) {
+                    if (node.nodeType === 1) {
+                        return SKIP[node.tagName] ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_SKIP;
+                    }
+                    return NodeFilter.FILTER_ACCEPT;
+                }
+            });
+            const parts = [];
+            let length = 0;
+            while (length < maxChars && walker.nextNode()) {
+                const piece = walker.currentNode.nodeValue.replace(/\\s+/g, ' ').trim();
+                if (piece) {
+                    parts.push(piece);
+                    length += piece.length + 1;
+                }
+            }
+            text = parts.join(' ').slice(0, maxChars);
+        }
+        window.__xenitPageText = text;
+    }
+    const all = window.__xenitPageText;
+    return {total: all.length, chunk: all.slice(offset, offset + chunkSize)};
+})(%d, %d, %d);
+"""
+
+class PageTextCache:
+    """Shared, size-bounded LRU of extracted page text, keyed by URL + content hash.
+
+    Identical content reached through several tabs is stored once; the most
+    recent extraction per URL is what get() returns.
+    """
+
+    def __init__(self, budget_chars=CACHE_BUDGET_CHARS):
+        self.budget_chars = budget_chars
+        self._entries = OrderedDict()  # (url, content hash) -> text
+        self._latest = {}              # url -> content hash
+        self.size_chars = 0
+
+    def put(self, url, text):
+        digest = hashlib.blake2b(text.encode('utf-8', errors='ignore'), digest_size=8).hexdigest()
+        key = (url, digest)
+        old_digest = self._latest.get(url)
+        if old_digest is not None and old_digest != digest:
+            self._drop((url, old_digest))
+        if key not in self._entries:
+            self._entries[key] = text
+            self.size_chars += len(text)
+        self._entries.move_to_end(key)
+        self._latest[url] = digest
+        self.trim(self.budget_chars)
+
+    def get(self, url):
+        digest = self._latest.get(url)
+        if digest is None:
+            return None
+        key = (url, digest)
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def trim(self, budget_chars):
+        """Evicts least recently used pages until the cache fits budget_chars."""
+        while self.size_chars > budget_chars and self._entries:
+            (url, digest), text = self._entries.popitem(last=False)
+            self.size_chars -= len(text)
+            if self._latest.get(url) == digest:
+                del self._latest[url]
+
+    def clear(self):
+        self._entries.clear()
+        self._latest.clear()
+        self.size_chars = 0
+
+    def shrink(self, level):
+        """Memory governor relief: a quarter of the budget when trimming, nothing past that."""
+        if level >= LEVEL_DROP_TEXT:
+            self.clear()
+        else:
+            self.trim(self.budget_chars // 4)
+
+    def _drop(self, key):
+        text = self._entries.pop(key, None)
+        if text is not None:
+            self.size_chars -= len(text)
+
+# One cache for every tab and window
+PAGE_TEXT_CACHE = PageTextCache()
+
+class PageTextExtraction:
+    """Pulls one page's main text over the bridge, chunk by chunk, into PAGE_TEXT_CACHE."""
+
+    def __init__(self, page, url, on_done):
+        self.page = page
+        self.url = url
+        self.on_done = on_done
+        self.chunks = []
+
+    def start(self):
+        self._request(0)
+
+    def _request(self, offset):
+        self.page.runJavaScript(EXTRACT_JS % (offset, CHUNK_CHARS, MAX_PAGE_TEXT_CHARS),
+                                QWebEngineScript.ScriptWorldId.ApplicationWorld, self._on_chunk)
+
+    def _on_chunk(self, result):
+        if not isinstance(result, dict) or not isinstance(result.get("chunk"), str):
+            self.on_done(None)
+            return
+        self.chunks.append(result["chunk"])
+        received = sum(len(c) for c in self.chunks)
+        total = int(result.get("total") or 0)
+        if result["chunk"] and received < total:
+            self._request(received)
+            return
+        text = "".join(self.chunks)
+        PAGE_TEXT_CACHE.put(self.url, text)
+        self.on_done(text)
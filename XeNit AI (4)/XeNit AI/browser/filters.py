@@ -0,0 +1,280 @@
+import re
+
+# Network filter engine for EasyList / Adblock Plus syntax.
+#
+# Supported: "||domain^" host anchors, "|" start/end anchors, "*" wildcards,
+# "^" separators, "@@" exceptions, /regex/ rules and the options
+# $third-party / $~third-party, $domain=a.com|~b.com and resource types
+# ($script, $image, $~xmlhttprequest, ...). Cosmetic rules (##, #@#) are skipped.
+#
+# Every filter is stored in a bucket keyed by one token (a run of [a-z0-9%])
+# that must appear in any URL it matches. A request only evaluates the filters
+# whose token occurs in its URL, so the cost depends on the URL, not on how
+# many tens of thousands of rules are loaded.
+
+RESOURCE_TYPES = {
+    "script", "image", "stylesheet", "object", "xmlhttprequest", "subdocument",
+    "ping", "media", "font", "websocket", "other", "document",
+}
+_TYPE_ALIASES = {
+    "xhr": "xmlhttprequest", "css": "stylesheet", "frame": "subdocument",
+    "object-subrequest": "object", "beacon": "ping", "doc": "document",
+}
+# Options that don't change which requests a rule matches
+_NEUTRAL_OPTIONS = {"match-case", "important", "all"}
+
+_TOKEN_RE = re.compile(r"[a-z0-9%]+")
+# Tokens too common to make a useful bucket; only used when nothing better exists
+_COMMON_TOKENS = {"http", "https", "www", "com", "net", "org", "html", "js", "php"}
+# Characters that are not separators for "^"
+_SEPARATOR = r"(?:[^a-z0-9_\-.%]|$)"
+_HOST_ANCHOR = r"^[a-z][a-z0-9+.\-]*://(?:[^/?#]*\.)?"
+_PLAIN_HOST_RE = re.compile(r"^[a-z0-9\-.]+$")
+
+def base_domain(host):
+    """Cheap registrable-domain guess (example.com, example.co.uk) without a suffix list."""
+    labels = host.rstrip('.').split('.')
+    if len(labels) > 2 and len(labels[-1]) == 2 and labels[-2] in ("co", "com", "net", "org", "gov", "ac", "edu"):
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+def is_third_party(host, source_host):
+    if not source_host:
+        return False
+    return base_domain(host) != base_domain(source_host)
+
+def _host_matches(host, domain):
+    return host == domain or host.endswith('.' + domain)
+
+class NetworkFilter:
+    __slots__ = ("text", "is_exception", "pattern", "anchor_host", "plain", "regex_source",
+                 "regex_flags", "_regex", "third_party", "types", "excluded_types", "domains", "excluded_domains")
+
+    def __init__(self, text):
+        self.text = text
+        self.is_exception = False
+        self.pattern = ""
+        self.anchor_host = None    # "||example.com^" rules: pure host suffix check
+        self.plain = False         # no wildcards/anchors: a substring test is enough
+        self.regex_source = None
+        self.regex_flags = 0       # re.IGNORECASE for /regex/ rules, kept in their original case
+        self._regex = None         # compiled lazily, most rules never get evaluated
+        self.third_party = None    # None = any, True = third-party only, False = first-party only
+        self.types = None
+        self.excluded_types = None
+        self.domains = None
+        self.excluded_domains = None
+
+    def matches(self, url, host, source_host, resource_type, third_party):
+        # Generic rules never block top-level navigations
+        if resource_type == "document" and (self.types is None or "document" not in self.types):
+            return False
+        if self.types is not None and resource_type not in self.types:
+            return False
+        if self.excluded_types is not None and resource_type in self.excluded_types:
+            return False
+        if self.third_party is not None and third_party != self.third_party:
+            return False
+        if self.domains is not None or self.excluded_domains is not None:
+            if not self._matches_source(source_host):
+                return False
+
+        if self.anchor_host is not None:
+            return _host_matches(host, self.anchor_host)
+        if self.plain:
+            return self.pattern in url
+        if self._regex is None:
+            self._regex = re.compile(self.regex_source, self.regex_flags)
+        return self._regex.search(url) is not None
+
+    def _matches_source(self, source_host):
+        if self.excluded_domains and source_host:
+            if any(_host_matches(source_host, d) for d in self.excluded_domains):
+                return False
+        if self.domains:
+            return bool(source_host) and any(_host_matches(source_host, d) for d in self.domains)
+        return True
+
+    def tokens(self):
+        """Tokens guaranteed to appear, whole, in every URL this filter matches."""
+        pattern = self.pattern
+        if self.regex_source is not None and pattern.startswith('/') and pattern.endswith('/'):
+            return []  # raw regex rule
+        tokens = []
+        for m in _TOKEN_RE.finditer(pattern):
+            start, end = m.start(), m.end()
+            before = pattern[start - 1] if start > 0 else None
+            after = pattern[end] if end < len(pattern) else None
+            # A token touching a wildcard or an unanchored pattern end may be
+            # only part of a longer token in the URL
+            if before in (None, '*') or after in (None, '*'):
+                continue
+            tokens.append(m.group())
+        return tokens
+
+def _pattern_to_regex(pattern):
+    regex = []
+    if pattern.startswith('||'):
+        regex.append(_HOST_ANCHOR)
+        pattern = pattern[2:]
+    elif pattern.startswith('|'):
+        regex.append('^')
+        pattern = pattern[1:]
+    end_anchor = pattern.endswith('|')
+    if end_anchor:
+        pattern = pattern[:-1]
+    for ch in pattern:
+        if ch == '*':
+            regex.append('.*')
+        elif ch == '^':
+            regex.append(_SEPARATOR)
+        else:
+            regex.append(re.escape(ch))
+    if end_anchor:
+        regex.append('$')
+    return ''.join(regex)
+
+def _parse_options(f, options):
+    """Applies $options to the filter. Returns False for options we can't honour."""
+    for option in options.split(','):
+        option = option.strip()
+        if not option:
+            continue
+        negated = option.startswith('~')
+        name = option[1:] if negated else option
+        if name.startswith('domain='):
+            for d in name[len('domain='):].split('|'):
+                if d.startswith('~'):
+                    f.excluded_domains = (f.excluded_domains or []) + [d[1:]]
+                elif d:
+                    f.domains = (f.domains or []) + [d]
+        elif name in ("third-party", "3p"):
+            f.third_party = not negated
+        elif name in ("first-party", "1p"):
+            f.third_party = negated
+        elif name in RESOURCE_TYPES or name in _TYPE_ALIASES:
+            name = _TYPE_ALIASES.get(name, name)
+            if negated:
+                f.excluded_types = (f.excluded_types or set()) | {name}
+            else:
+                f.types = (f.types or set()) | {name}
+        elif name in _NEUTRAL_OPTIONS:
+            continue
+        else:
+            # $popup, $csp, $redirect, $removeparam, ... : not a plain block/allow rule
+            return False
+    return True
+
+def parse_filter(line):
+    """Parses one EasyList line into a NetworkFilter, or None if it isn't a usable network rule."""
+    line = line.strip()
+    if not line or line.startswith('!') or line.startswith('['):
+        return None
+    if '##' in line or '#@#' in line or '#?#' in line or '#$#' in line:
+        return None  # cosmetic
+
+    f = NetworkFilter(line)
+    text = line
+    if text.startswith('@@'):
+        f.is_exception = True
+        text = text[2:]
+
+    # Options follow the last "$" (a regex rule may contain "$" itself)
+    if '$' in text and not (text.startswith('/') and text.endswith('/')):
+        text, options = text.rsplit('$', 1)
+        if not _parse_options(f, options.lower()):
+            return None
+    if not text or text == '*':
+        if f.types is None and f.domains is None and f.third_party is None:
+            return None  # would match everything
+        text = '*'
+
+    if len(text) > 2 and text.startswith('/') and text.endswith('/'):
+        # Regex bodies keep their case: lowercasing turns \D, \W, \S into \d, \w, \s
+        f.pattern = text
+        f.regex_source = text[1:-1]
+        f.regex_flags = re.IGNORECASE
+        return f
+
+    text = text.lower()
+    f.pattern = text
+
+    if text.startswith('||'):
+        host_part = text[2:]
+        if host_part.endswith('^'):
+            host_part = host_part[:-1]
+        if host_part and _PLAIN_HOST_RE.match(host_part):
+            f.anchor_host = host_part
+            return f
+    if not any(ch in text for ch in '*^|'):
+        f.plain = True
+        return f
+    f.regex_source = _pattern_to_regex(text)
+    return f
+
+class FilterEngine:
+    def __init__(self):
+        self._block = {}   # token -> [NetworkFilter]
+        self._allow = {}
+        self.rule_count = 0
+
+    def add_filters(self, lines):
+        """Parses and indexes rules (an iterable of lines). Returns how many were usable."""
+        added = 0
+        for line in lines:
+            f = parse_filter(line)
+            if f is None:
+                continue
+            buckets = self._allow if f.is_exception else self._block
+            buckets.setdefault(self._pick_token(f, buckets), []).append(f)
+            added += 1
+        self.rule_count += added
+        return added
+
+    def _pick_token(self, f, buckets):
+        tokens = f.tokens()
+        if f.anchor_host is not None:
+            # The host itself is always a run of tokens in the URL
+            tokens = _TOKEN_RE.findall(f.anchor_host)
+        if not tokens:
+            return ""  # untokenized bucket, checked on every request
+        # The rarest token keeps buckets small
+        candidates = [t for t in tokens if t not in _COMMON_TOKENS] or tokens
+        return min(candidates, key=lambda t: len(buckets.get(t, ())))
+
+    def _find(self, buckets, url, tokens, host, source_host, resource_type, third_party):
+        for token in tokens:
+            for f in buckets.get(token, ()):
+                if f.matches(url, host, source_host, resource_type, third_party):
+                    return f
+        return None
+
+    def match(self, url, host, source_host=None, resource_type="other", third_party=None):
+        """Returns the filter that blocks this request, or None if it is allowed.
+
+        url and host are expected lowercase, with any trailing host dot removed.
+        """
+        if not self._block:
+            return None
+        if third_party is None:
+            third_party = is_third_party(host, source_host)
+        tokens = set(_TOKEN_RE.findall(url))
+        tokens.add("")
+        f = self._find(self._block, url, tokens, host, source_host, resource_type, third_party)
+        if f is None:
+            return None
+        if self._allow and self._find(self._allow, url, tokens, host, source_host, resource_type, third_party):
+            return None
+        return f
+
+    def release_compiled(self):
+        """Drops every lazily compiled rule regex; they recompile on their next use."""
+        released = 0
+        for buckets in (self._block, self._allow):
+            for rules in buckets.values():
+                for f in rules:
+                    if f._regex is not None:
+                        f._regex = None
+                        released += 1
+        re.purge()
+        return released
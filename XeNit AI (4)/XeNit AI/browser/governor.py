@@ -0,0 +1,143 @@
+import os
+import time
+from PyQt6.QtCore import QObject, QTimer, QCoreApplication, pyqtSignal
+from browser.procinfo import process_tree_memory, physical_memory
+
+# Relief levels, each one includes everything below it
+LEVEL_NONE = 0
+LEVEL_TRIM = 1       # shrink caches
+LEVEL_DROP_TEXT = 2  # drop extracted page text and old chat
+LEVEL_FREEZE = 3     # freeze every background tab
+LEVEL_DISCARD = 4    # discard background tabs, least recently used first
+
+LEVEL_NAMES = {
+    LEVEL_NONE: "none",
+    LEVEL_TRIM: "trim caches",
+    LEVEL_DROP_TEXT: "drop page text",
+    LEVEL_FREEZE: "freeze tabs",
+    LEVEL_DISCARD: "discard tabs",
+}
+
+class MemoryGovernor(QObject):
+    """Keeps the browser's process tree (UI + renderers + GPU) under a memory budget.
+
+    Usage is the tree's PSS (or USS) where available, see process_footprint().
+    Subsystems register shrink callbacks with the level they belong to. While
+    the tree is over budget, checks escalate one level at a time and run each
+    callback registered at or below it, with the current level as argument.
+    A level is held for LEVEL_HOLD_SEC before the next one, so freezing or
+    discarding gets time to show up in the numbers. Pressure resets once
+    usage falls under RELIEF_RATIO of the budget.
+    """
+    pressure_changed = pyqtSignal(int)  # new level
+
+    CHECK_INTERVAL_MS = 15000
+    SETTLE_MS = 3000        # re-check soon after relief, freed memory shows up quickly
+    LEVEL_HOLD_SEC = 15     # minimum time at a level before escalating
+    RELIEF_RATIO = 0.85
+    DEFAULT_BUDGET_MB = 2048
+    MAX_DEFAULT_BUDGET_MB = 4096
+
+    def __init__(self, parent=None, budget_mb=None):
+        super().__init__(parent)
+        self.budget_bytes = self._default_budget() if budget_mb is None else budget_mb * 1024 * 1024
+        self.level = LEVEL_NONE
+        self.last_usage = 0
+        self._relieved_at = 0.0  # monotonic time the current level was entered
+        self._callbacks = []  # [(level, name, callback)]
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+        if process_tree_memory() is None:
+            print("XeNit Memory: Process memory can't be read here, budget not enforced")
+        else:
+            self.timer.start(self.CHECK_INTERVAL_MS)
+
+    def _default_budget(self):
+        # XENIT_MEMORY_BUDGET_MB wins, else half the machine's RAM up to a ceiling
+        env = os.environ.get("XENIT_MEMORY_BUDGET_MB", "")
+        if env.isdigit() and int(env) > 0:
+            return int(env) * 1024 * 1024
+        total = physical_memory()
+        if total:
+            return min(total // 2, self.MAX_DEFAULT_BUDGET_MB * 1024 * 1024)
+        return self.DEFAULT_BUDGET_MB * 1024 * 1024
+
+    def set_budget_mb(self, budget_mb):
+        self.budget_bytes = int(budget_mb) * 1024 * 1024
+        self.check()
+
+    # --- Registration ---
+
+    def register(self, name, callback, level=LEVEL_TRIM, owner=None):
+        """Adds callback(level) to the relief run at level and above.
+
+        Registering the same callback again is a no-op. With an owner QObject,
+        the callback goes away when the owner is destroyed.
+        """
+        if any(cb == callback for _lvl, _name, cb in self._callbacks):
+            return
+        entry = (level, name, callback)
+        self._callbacks.append(entry)
+        self._callbacks.sort(key=lambda e: e[0])
+        if owner is not None:
+            owner.destroyed.connect(lambda *_, entry=entry: self._remove(entry))
+
+    def unregister(self, callback):
+        self._callbacks = [e for e in self._callbacks if e[2] != callback]
+
+    def _remove(self, entry):
+        if entry in self._callbacks:
+            self._callbacks.remove(entry)
+
+    # --- Enforcement ---
+
+    def check(self):
+        usage = process_tree_memory()
+        if usage is None:
+            return
+        self.last_usage = usage
+        if usage > self.budget_bytes:
+            held = time.monotonic() - self._relieved_at
+            if self.level == LEVEL_NONE or held >= self.LEVEL_HOLD_SEC:
+                self.relieve(min(self.level + 1, LEVEL_DISCARD))
+            self.timer.start(self.SETTLE_MS)
+            return
+        if usage < self.budget_bytes * self.RELIEF_RATIO and self.level != LEVEL_NONE:
+            print(f"XeNit Memory: Back under budget ({usage >> 20} MB)")
+            self.level = LEVEL_NONE
+            self.pressure_changed.emit(self.level)
+        self.timer.start(self.CHECK_INTERVAL_MS)
+
+    def relieve(self, level):
+        """Runs every callback registered at or below level."""
+        self._relieved_at = time.monotonic()
+        if level != self.level:
+            self.level = level
+            self.pressure_changed.emit(level)
+        print(f"XeNit Memory: {self.last_usage >> 20} MB of {self.budget_bytes >> 20} MB, "
+              f"relief level {level} ({LEVEL_NAMES[level]})")
+        for cb_level, name, callback in list(self._callbacks):
+            if cb_level > level:
+                break
+            try:
+                callback(level)
+            except Exception as e:
+                print(f"XeNit Memory: '{name}' failed to shrink: {e}")
+
+    def stats(self):
+        return {
+            "usage": self.last_usage,
+            "budget": self.budget_bytes,
+            "level": self.level,
+            "callbacks": [name for _lvl, name, _cb in self._callbacks],
+        }
+
+_governor = None
+
+def memory_governor():
+    """The app-wide governor, created on first use (needs a running QApplication)."""
+    global _governor
+    if _governor is None:
+        _governor = MemoryGovernor(QCoreApplication.instance())
+    return _governor
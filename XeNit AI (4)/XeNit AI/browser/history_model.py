@@ -0,0 +1,150 @@
+from functools import partial
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from browser.data_manager import DataManager
+
+class PagedListModel(QAbstractListModel):
+    """List model that pulls its rows a page at a time as the view scrolls.
+
+    Views only ask for the rows they show and call fetchMore() when they reach
+    the end of what's loaded, so opening a view costs one page no matter how
+    long the list is. Rows are dicts with at least a "url", which is what
+    the views' click handlers read back through Qt.ItemDataRole.UserRole.
+    Subclasses implement fetch_page() and display_text().
+    """
+
+    PAGE_SIZE = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.data_manager = DataManager()
+        self._rows = []
+        self._exhausted = False
+        self.data_manager.add_listener(self._on_data_changed)
+        # DataManager outlives every view, don't leave it calling a deleted model
+        self.destroyed.connect(partial(self.data_manager.remove_listener, self._on_data_changed))
+
+    # --- Subclass hooks ---
+
+    def fetch_page(self, count):
+        """Up to count rows following the loaded ones (fewer means the end was reached)."""
+        raise NotImplementedError
+
+    def display_text(self, item):
+        raise NotImplementedError
+
+    def reset_cursor(self):
+        """Forget where paging stopped; reload() starts over from the top."""
+
+    def _on_data_changed(self, kind, item):
+        pass
+
+    # --- Qt model API ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        item = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display_text(item)
+        if role in (Qt.ItemDataRole.UserRole, Qt.ItemDataRole.ToolTipRole):
+            return item.get('url')
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        items = self.fetch_page(self.PAGE_SIZE)
+        if len(items) < self.PAGE_SIZE:
+            self._exhausted = True
+        if items:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(items) - 1)
+            self._rows.extend(items)
+            self.endInsertRows()
+
+    def reload(self):
+        """Drops the loaded rows and loads the first page again."""
+        self.beginResetModel()
+        self._rows = []
+        self._exhausted = False
+        self.reset_cursor()
+        self.endResetModel()
+        self.fetchMore()
+
+    def _insert_row(self, row, item):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, item)
+        self.endInsertRows()
+
+class HistoryListModel(PagedListModel):
+    """Browsing history newest first, paged from history.db by visit id.
+
+    New visits are inserted at the top as they happen. With a search query
+    set the model holds the full-text results instead (already capped, so a
+    single page) and doesn't follow new visits.
+    """
+
+    SEARCH_LIMIT = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.query = ""
+        self._before_id = None  # lowest visit id loaded so far
+        # First page right away: visits arriving later are newer than any paged row
+        self.fetchMore()
+
+    def set_query(self, text):
+        self.query = text.strip()
+        self.reload()
+
+    def reset_cursor(self):
+        self._before_id = None
+
+    def fetch_page(self, count):
+        if self.query:
+            if self._rows:
+                return []
+            return self.data_manager.search_history(self.query, self.SEARCH_LIMIT)
+        items = self.data_manager.get_history_page(self._before_id, count)
+        if items:
+            self._before_id = items[-1]['id']
+        return items
+
+    def display_text(self, item):
+        # Title and URL, plus the matching text when searching. Search rows
+        # always get the third line so every row in a view is the same height.
+        text = f"{item.get('title') or 'No Title'}\n{item.get('url', '')}"
+        if self.query:
+            text += f"\n{item.get('snippet') or ''}"
+        return text
+
+    def _on_data_changed(self, kind, item):
+        if kind == "visit" and not self.query:
+            self._insert_row(0, item)
+        elif kind == "clear":
+            self.reload()
+
+class BookmarkListModel(PagedListModel):
+    """Bookmarks in the order they were added, paged out of DataManager's list."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.fetchMore()
+
+    def fetch_page(self, count):
+        start = len(self._rows)
+        return self.data_manager.get_bookmarks()[start:start + count]
+
+    def display_text(self, item):
+        return f"{item.get('title') or 'No Title'}\n{item.get('url', '')}"
+
+    def _on_data_changed(self, kind, item):
+        # Not fully loaded yet: the next fetchMore() picks it up from the list
+        if kind == "bookmark" and self._exhausted:
+            self._insert_row(len(self._rows), item)
@@ -0,0 +1,108 @@
+import json
+import os
+import sqlite3
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS visits (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS visits_url ON visits(url);
+CREATE INDEX IF NOT EXISTS visits_timestamp ON visits(timestamp);
+"""
+
+def visit_stats(path, upto_id):
+    """Per-URL (url, latest title, visit count, last timestamp) for visits up to upto_id.
+
+    Opens its own connection, so it can run on a worker thread.
+    """
+    db = sqlite3.connect(path)
+    try:
+        return db.execute(
+            "SELECT url, title, COUNT(*), MAX(timestamp) FROM visits WHERE id <= ? GROUP BY url",
+            (upto_id or 0,)).fetchall()
+    finally:
+        db.close()
+
+def _row(row):
+    return {"title": row[0], "url": row[1], "timestamp": row[2]}
+
+class HistoryStore:
+    """Browsing history in SQLite (WAL): one row per visit, newest = highest id.
+
+    Adding a visit is a single indexed INSERT instead of rewriting a file, and
+    there is no size cap. Rows come back as the same {title, url, timestamp}
+    dicts history.json held.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: a power cut can lose the last visits, never corrupt the file
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.db.commit()
+
+    def add(self, title, url, timestamp):
+        with self.db:
+            self.db.execute("INSERT INTO visits (url, title, timestamp) VALUES (?, ?, ?)",
+                            (url, title or "", timestamp))
+
+    def latest(self):
+        row = self.db.execute("SELECT title, url, timestamp FROM visits ORDER BY id DESC LIMIT 1").fetchone()
+        return _row(row) if row else None
+
+    def recent(self, limit=None, offset=0):
+        """Visits newest first; everything when limit is None."""
+        rows = self.db.execute(
+            "SELECT title, url, timestamp FROM visits ORDER BY id DESC LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset))
+        return [_row(row) for row in rows]
+
+    def page(self, before_id=None, limit=200):
+        """Visits older than before_id, newest first, each with its "id".
+
+        Keyset paging: a page deep into the history costs the same as the first.
+        """
+        rows = self.db.execute(
+            "SELECT id, title, url, timestamp FROM visits WHERE id < ? ORDER BY id DESC LIMIT ?",
+            (2 ** 63 - 1 if before_id is None else before_id, limit))
+        return [dict(_row(row[1:]), id=row[0]) for row in rows]
+
+    def last_id(self):
+        return self.db.execute("SELECT MAX(id) FROM visits").fetchone()[0] or 0
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM visits").fetchone()[0]
+
+    def clear(self):
+        with self.db:
+            self.db.execute("DELETE FROM visits")
+        self.db.execute("VACUUM")
+
+    def migrate_json(self, json_path):
+        """One-time import of a history.json (newest first), renamed to *.migrated afterwards."""
+        if not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, 'r') as f:
+                items = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"XeNit History: Could not read {json_path} for migration: {e}")
+            return 0
+        rows = [(item.get("url", ""), item.get("title") or "", item.get("timestamp", ""))
+                for item in reversed(items) if isinstance(item, dict) and item.get("url")]
+        with self.db:
+            self.db.executemany("INSERT INTO visits (url, title, timestamp) VALUES (?, ?, ?)", rows)
+        os.replace(json_path, json_path + ".migrated")
+        print(f"XeNit History: Migrated {len(rows)} entries from history.json")
+        return len(rows)
+
+    def close(self):
+        self.db.close()
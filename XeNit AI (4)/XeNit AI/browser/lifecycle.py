@@ -0,0 +1,228 @@
+import time
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEnginePage
+from browser.data_manager import DataManager
+from browser.governor import LEVEL_DISCARD
+from browser.performance import active_settings
+
+LifecycleState = QWebEnginePage.LifecycleState
+
+STATE_NAMES = {
+    LifecycleState.Active: "active",
+    LifecycleState.Frozen: "frozen",
+    LifecycleState.Discarded: "discarded",
+}
+
+# True when any form field differs from what the page was served with
+# (typed text, toggled boxes, changed selects) or a rich-text editor has focus
+DIRTY_FORM_JS = """
+(function() {
+    const fields = document.querySelectorAll('input, textarea, select');
+    for (let i = 0; i < fields.length && i < 2000; i++) {
+        const el = fields[i];
+        if (el.tagName === 'SELECT') {
+            for (const opt of el.options) {
+                if (opt.selected !== opt.defaultSelected) return true;
+            }
+        } else if (el.type === 'checkbox' || el.type === 'radio') {
+            if (el.checked !== el.defaultChecked) return true;
+        } else if (el.type !== 'hidden' && el.type !== 'submit' && el.type !== 'button') {
+            if (el.value !== el.defaultValue) return true;
+        }
+    }
+    const active = document.activeElement;
+    return !!(active && active.isContentEditable);
+})();
+"""
+
+class TabLifecyclePolicy(QObject):
+    """Freezes tabs that stay hidden; under memory pressure the governor has the
+    oldest ones discarded (shrink()).
+
+    Frozen tabs keep their DOM but run no JavaScript, timers or media; discarded
+    tabs drop the renderer entirely and reload when shown again. Tabs playing
+    audio or holding unsaved form input are never touched.
+
+    The freeze delay is the "tab_freeze_after_sec" setting, else the active
+    performance profile's "freeze_after_sec", else FREEZE_AFTER_SEC.
+    """
+    state_changed = pyqtSignal(object, str)  # view, state name
+
+    FREEZE_AFTER_SEC = 5 * 60
+    SETTING_KEY = "tab_freeze_after_sec"
+    CHECK_INTERVAL_MS = 30 * 1000
+
+    def __init__(self, tab_manager):
+        super().__init__(tab_manager)
+        self.tabs = tab_manager
+        self.enabled = True
+        self._last_seen = {}   # view -> monotonic time it was last the current tab
+        self._exempt = {}      # view -> reason ("audio", "form") from the last check
+        self._frozen_clean = set()  # views frozen here after a clean form probe
+        self._current = None
+
+        self.tabs.currentChanged.connect(self._on_current_changed)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+        self.timer.start(self.CHECK_INTERVAL_MS)
+
+    def _views(self):
+        for i in range(self.tabs.count()):
+            view = self.tabs.widget(i)
+            if hasattr(view, 'page') and callable(view.page):
+                yield view
+
+    def _on_current_changed(self, index):
+        now = time.monotonic()
+        # The tab being left was visible until now, the new one is visible from now
+        if self._current is not None:
+            self._last_seen[self._current] = now
+        current = self.tabs.widget(index)
+        if hasattr(current, 'page') and callable(current.page):
+            self._current = current
+            self._last_seen[current] = now
+            self.activate(current)
+        else:
+            self._current = None
+
+    def activate(self, view):
+        """Brings a tab back to Active; a discarded tab reloads here."""
+        page = view.page()
+        self._frozen_clean.discard(view)
+        if page.lifecycleState() != LifecycleState.Active:
+            page.setLifecycleState(LifecycleState.Active)
+            self.state_changed.emit(view, "active")
+
+    @property
+    def freeze_after(self):
+        # Read on every check, so a changed setting applies without a restart
+        default = active_settings().get("freeze_after_sec", self.FREEZE_AFTER_SEC)
+        try:
+            return float(DataManager().get_setting(self.SETTING_KEY, default))
+        except (TypeError, ValueError):
+            return float(default)
+
+    def hidden_for(self, view):
+        if view is self.tabs.currentWidget() or view not in self._last_seen:
+            return 0.0
+        return time.monotonic() - self._last_seen[view]
+
+    def state(self, view):
+        """Per-tab lifecycle info: state name, seconds hidden, exemption reason (or None)."""
+        return {
+            "state": STATE_NAMES.get(view.page().lifecycleState(), "active"),
+            "hidden_for": self.hidden_for(view),
+            "exempt": self._exempt.get(view),
+        }
+
+    def tab_states(self):
+        return [(view, self.state(view)) for view in self._views()]
+
+    def check(self):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        current = self.tabs.currentWidget()
+        live = list(self._views())
+        for view in live:
+            if view is current:
+                self._last_seen[view] = now
+            else:
+                self._last_seen.setdefault(view, now)
+        # Forget closed tabs
+        for view in list(self._last_seen):
+            if view not in live:
+                self._last_seen.pop(view, None)
+                self._exempt.pop(view, None)
+                self._frozen_clean.discard(view)
+                if view is self._current:
+                    self._current = None
+
+        # Only freezing here: discarding is the memory governor's call (shrink())
+        freeze_after = self.freeze_after
+        for view in live:
+            if view is current or view.isVisible():
+                continue
+            if view.page().lifecycleState() == LifecycleState.Active \
+                    and self.hidden_for(view) >= freeze_after:
+                self._try_set(view, LifecycleState.Frozen)
+
+    def discard_background_tabs(self, count):
+        """Discards up to count background tabs, longest hidden first. Returns how many were queued."""
+        current = self.tabs.currentWidget()
+        candidates = [v for v in self._views() if v is not current and not v.isVisible()
+                      and v.page().lifecycleState() != LifecycleState.Discarded]
+        candidates.sort(key=self.hidden_for, reverse=True)
+        for view in candidates[:count]:
+            self._try_set(view, LifecycleState.Discarded)
+        return min(count, len(candidates))
+
+    def freeze_background_tabs(self):
+        """Freezes every hidden tab now, however briefly it has been hidden."""
+        current = self.tabs.currentWidget()
+        for view in self._views():
+            if view is not current and not view.isVisible() \
+                    and view.page().lifecycleState() == LifecycleState.Active:
+                self._try_set(view, LifecycleState.Frozen)
+
+    def shrink(self, level):
+        """Memory governor relief: freeze all background tabs, then discard half
+        of the ones still holding a renderer, least recently used first."""
+        self.freeze_background_tabs()
+        if level >= LEVEL_DISCARD:
+            current = self.tabs.currentWidget()
+            live = [v for v in self._views() if v is not current
+                    and v.page().lifecycleState() != LifecycleState.Discarded]
+            if live:
+                self.discard_background_tabs(max(1, len(live) // 2))
+
+    def discard(self, view):
+        """Discards a background tab right away (explicit user action, no exemptions)."""
+        if view is self.tabs.currentWidget() or view.isVisible():
+            return False
+        self._apply(view, LifecycleState.Discarded)
+        return True
+
+    def _try_set(self, view, target):
+        page = view.page()
+        # 1. Audio: cheap, synchronous
+        if page.recentlyAudible():
+            self._exempt[view] = "audio"
+            return
+        # 2. Chromium's own veto (e.g. devtools attached, page still visible)
+        if page.recommendedState() == LifecycleState.Active:
+            self._exempt[view] = None
+            return
+        # 3. Unsaved form input: ask the page. Frozen pages can't run script, so
+        # they go by the probe made when they were frozen, and by Chromium's own
+        # form-interaction / PDF signals, which recommend Frozen over Discarded
+        if page.lifecycleState() == LifecycleState.Frozen:
+            if view not in self._frozen_clean:
+                self._exempt[view] = "form"
+                return
+            if target == LifecycleState.Discarded \
+                    and page.recommendedState() != LifecycleState.Discarded:
+                self._exempt[view] = None
+                return
+            self._apply(view, target)
+            return
+        def on_probe(dirty, view=view):
+            if view not in self._last_seen or view is self.tabs.currentWidget():
+                return
+            if dirty:
+                self._exempt[view] = "form"
+                return
+            if target == LifecycleState.Frozen:
+                self._frozen_clean.add(view)
+            self._apply(view, target)
+        page.runJavaScript(DIRTY_FORM_JS, on_probe)
+
+    def _apply(self, view, target):
+        page = view.page()
+        if page.lifecycleState() == target or view.isVisible():
+            return
+        self._exempt[view] = None
+        page.setLifecycleState(target)
+        name = STATE_NAMES[target]
+        print(f"XeNit Lifecycle: {name.capitalize()} tab '{view.title()[:40]}'")
+        self.state_changed.emit(view, name)
@@ -1,6 +1,7 @@
 import json
 import os
 from datetime import datetime
+from browser.persistence import WriteBehind
 
 class MemoryManager:
     def __init__(self, storage_file="xenit_memory.json"):
@@ -29,11 +30,8 @@ class MemoryManager:
                 print(f"XeNit Memory Load Error: {e}")
 
     def save_memory(self):
-        try:
-            with open(self.storage_file, 'w') as f:
-                json.dump(self.memory, f, indent=4)
-        except Exception as e:
-            print(f"XeNit Memory Save Error: {e}")
+        # Coalesced and written off the UI thread (log_visit calls this on every visit)
+        WriteBehind().schedule(self.storage_file, self.memory, indent=4)
 
     def set_preference(self, key, value):
         self.memory["preferences"][key] = value
@@ -53,10 +53,14 @@ class CustomMenu(QMenu):
         self.addSeparator()
         
         # Tools
+        self.adblock_action = QAction("Shield Stats", self)
+        self.task_manager_action = QAction("Task Manager (Shift+Esc)", self)
         self.settings_action = QAction("Settings", self)
         self.help_action = QAction("Help", self)
         self.exit_action = QAction("Exit", self)
         
+        self.addAction(self.adblock_action)
+        self.addAction(self.task_manager_action)
         self.addAction(self.settings_action)
         self.addAction(self.help_action)
         self.addSeparator()
@@ -0,0 +1,341 @@
+import heapq
+import re
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QObject, QCoreApplication, QModelIndex
+from PyQt6.QtGui import QStandardItemModel, QStandardItem
+from PyQt6.QtWidgets import QCompleter
+from browser.data_manager import DataManager
+from browser.history_store import visit_stats
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_SCHEME_RE = re.compile(r"^[a-z][a-z0-9+.-]*://(www\.)?")
+
+URL_ROLE = Qt.ItemDataRole.UserRole + 1
+
+def url_key(url):
+    """What people type for a URL: lowercase, no scheme, no www."""
+    return _SCHEME_RE.sub("", url.lower())
+
+def query_key(text):
+    """Typed text in url_key() form; a typed "www." is dropped like a stored one."""
+    query = url_key(text.strip())
+    return query[4:] if query.startswith("www.") else query
+
+def _timestamp(value):
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+class FrecencyIndex:
+    """In-memory completion index over history and bookmarks, ranked by frecency.
+
+    frecency = (visits + a bonus if bookmarked) x 0.5 ** (days since last visit / HALF_LIFE_DAYS)
+
+    One or two typed characters match too much to scan, so they are checked
+    against the TOP_SIZE highest-frecency URLs only. Longer input looks up a
+    sorted prefix index (URL without scheme/www, and every title word), and
+    falls back to a trigram index for matches inside a URL (title words are
+    already covered by the prefix index) when prefixes find too little.
+    Plain Python, no Qt, so it can be built on a worker thread.
+    """
+
+    HALF_LIFE_DAYS = 14.0
+    BOOKMARK_VISITS = 10
+    # A match at the start of the URL beats one at a title word beats one anywhere
+    URL_PREFIX_BOOST = 4.0
+    WORD_PREFIX_BOOST = 2.0
+    MAX_CANDIDATES = 3000
+    TOP_SIZE = 2000
+    # Only this much of a URL goes into the trigram index
+    TRIGRAM_CHARS = 48
+
+    def __init__(self):
+        self.entries = {}     # url -> [title, visits, last visit (epoch), bookmarked]
+        self._keys = {}       # url -> (url key, " word word ..." of the title)
+        self._prefixes = []   # sorted [(key, url, is url key)]
+        self._trigrams = {}   # trigram -> set(url)
+        # Highest frecency URLs, best first; new visits are appended after
+        # _top_sorted entries until the list is re-cut at 2x TOP_SIZE
+        self._top = []
+        self._top_sorted = 0
+        self._top_set = set()
+
+    def __len__(self):
+        return len(self.entries)
+
+    # --- Updates ---
+
+    def load(self, visit_rows, bookmarks):
+        """Bulk build from (url, title, visit count, last timestamp) rows and bookmark dicts."""
+        for url, title, count, last_visit in visit_rows:
+            self.entries[url] = [title or "", count, _timestamp(last_visit), False]
+        for item in bookmarks:
+            url = item.get("url")
+            if url:
+                entry = self.entries.setdefault(url, [item.get("title") or "", 0, time.time(), False])
+                entry[3] = True
+        # One sort at the end instead of an insort per key
+        for url, entry in self.entries.items():
+            self._prefixes.extend(self._index_keys(url, entry[0]))
+            for gram in self._grams(url):
+                self._trigrams.setdefault(gram, set()).add(url)
+        self._prefixes.sort()
+        self._recut_top()
+
+    def add_visit(self, url, title, when=None, count=1):
+        when = time.time() if when is None else when
+        entry = self.entries.get(url)
+        if entry is None:
+            entry = self.entries[url] = [title or "", count, when, False]
+            self._index(url, entry[0])
+        else:
+            if title and title != entry[0]:
+                self._unindex(url, entry[0])
+                entry[0] = title
+                self._index(url, title)
+            entry[1] += count
+            entry[2] = max(entry[2], when)
+        # Just visited: recent enough to be a short-input candidate
+        if url not in self._top_set:
+            self._top.append(url)
+            self._top_set.add(url)
+            if len(self._top) > 2 * self.TOP_SIZE:
+                self._recut_top()
+
+    def add_bookmark(self, url, title):
+        if url not in self.entries:
+            self.add_visit(url, title, when=time.time(), count=0)
+        self.entries[url][3] = True
+
+    def clear_history(self):
+        """Forgets visits; bookmarks stay completable."""
+        for url, entry in list(self.entries.items()):
+            if entry[3]:
+                entry[1] = 0
+            else:
+                self._unindex(url, entry[0])
+                del self.entries[url]
+        self._recut_top()
+
+    def _recut_top(self):
+        now = time.time()
+        self._top = heapq.nlargest(self.TOP_SIZE, self.entries,
+                                   key=lambda url: self.frecency(self.entries[url], now))
+        self._top_sorted = len(self._top)
+        self._top_set = set(self._top)
+
+    def _index_keys(self, url, title):
+        own = url_key(url)
+        words = list(dict.fromkeys(_WORD_RE.findall(title.lower())))
+        self._keys[url] = (own, " " + " ".join(words))
+        keys = [(word, url, False) for word in words if word != own]
+        keys.append((own, url, True))
+        return keys
+
+    def _grams(self, url):
+        text = url_key(url)[:self.TRIGRAM_CHARS]
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def _index(self, url, title):
+        for key in self._index_keys(url, title):
+            insort(self._prefixes, key)
+        for gram in self._grams(url):
+            self._trigrams.setdefault(gram, set()).add(url)
+
+    def _unindex(self, url, title):
+        for key in self._index_keys(url, title):
+            i = bisect_left(self._prefixes, key)
+            if i < len(self._prefixes) and self._prefixes[i] == key:
+                del self._prefixes[i]
+        for gram in self._grams(url):
+            urls = self._trigrams.get(gram)
+            if urls is not None:
+                urls.discard(url)
+                if not urls:
+                    del self._trigrams[gram]
+        self._keys.pop(url, None)
+        if url in self._top_set:
+            i = self._top.index(url)
+            del self._top[i]
+            self._top_set.discard(url)
+            if i < self._top_sorted:
+                self._top_sorted -= 1
+
+    # --- Queries ---
+
+    def frecency(self, entry, now):
+        visits = entry[1] + (self.BOOKMARK_VISITS if entry[3] else 0)
+        age_days = max(0.0, now - entry[2]) / 86400.0
+        return visits * 0.5 ** (age_days / self.HALF_LIFE_DAYS)
+
+    def complete(self, text, limit=8):
+        """Top entries for what's typed so far: [(url, title)], best first."""
+        query = query_key(text)
+        if not query:
+            return []
+        boosts = {}
+
+        if len(query) < 3:
+            # 1a. Short input: only the most frecent URLs. The sorted part is
+            # walked best first and left early, recent visits are all checked.
+            word_start = " " + query
+            wanted = limit * 4
+            recent = self._top[self._top_sorted:]
+            for i, url in enumerate(recent + self._top[:self._top_sorted]):
+                own, words = self._keys[url]
+                if own.startswith(query):
+                    boosts[url] = self.URL_PREFIX_BOOST
+                elif word_start in words:
+                    boosts[url] = self.WORD_PREFIX_BOOST
+                else:
+                    continue
+                if len(boosts) >= wanted and i >= len(recent):
+                    break
+        else:
+            # 1b. Prefix matches (URL key or any title word)
+            i = bisect_left(self._prefixes, (query,))
+            end = min(len(self._prefixes), i + self.MAX_CANDIDATES)
+            while i < end:
+                key, url, is_url = self._prefixes[i]
+                if not key.startswith(query):
+                    break
+                boost = self.URL_PREFIX_BOOST if is_url else self.WORD_PREFIX_BOOST
+                if boost > boosts.get(url, 0.0):
+                    boosts[url] = boost
+                i += 1
+
+            # 2. Too few: matches anywhere, checked from the rarest trigram's posting set
+            if len(boosts) < limit:
+                postings = [self._trigrams.get(query[j:j + 3]) for j in range(len(query) - 2)]
+                if all(postings):
+                    for checked, url in enumerate(min(postings, key=len)):
+                        if checked >= self.MAX_CANDIDATES:
+                            break
+                        if url not in boosts and query in self._keys[url][0]:
+                            boosts[url] = 1.0
+
+        now = time.time()
+        best = heapq.nlargest(limit, boosts.items(),
+                              key=lambda item: item[1] * self.frecency(self.entries[item[0]], now))
+        return [(url, self.entries[url][0]) for url, _boost in best]
+
+class FrecencyLoader(QThread):
+    """Builds a FrecencyIndex from history.db (visits up to a given id) and the bookmarks."""
+    loaded = pyqtSignal(object)
+
+    def __init__(self, db_path, upto_id, bookmarks, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.upto_id = upto_id
+        self.bookmarks = bookmarks
+
+    def run(self):
+        started = time.perf_counter()
+        index = FrecencyIndex()
+        try:
+            rows = visit_stats(self.db_path, self.upto_id)
+        except Exception as e:
+            print(f"XeNit Omnibox: Could not read history: {e}")
+            rows = []
+        index.load(rows, self.bookmarks)
+        print(f"XeNit Omnibox: Indexed {len(index)} URLs in {(time.perf_counter() - started) * 1000:.0f} ms")
+        self.loaded.emit(index)
+
+class CompletionService(QObject):
+    """The app-wide FrecencyIndex, loaded in the background and kept in step with DataManager."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.data_manager = DataManager()
+        self.index = FrecencyIndex()
+        self._replay = []   # changes made while the loader runs, applied to its result
+        self.data_manager.add_listener(self._on_data_changed)
+
+        self.loader = FrecencyLoader(self.data_manager.history_db_file, self.data_manager.history_store.last_id(),
+                                     list(self.data_manager.get_bookmarks()), self)
+        self.loader.loaded.connect(self._on_loaded)
+        self.loader.start()
+
+    def _on_data_changed(self, kind, item):
+        if self.loader is not None:
+            self._replay.append((kind, item))
+        self._apply(self.index, kind, item)
+
+    def _apply(self, index, kind, item):
+        if kind == "visit":
+            index.add_visit(item["url"], item["title"], _timestamp(item["timestamp"]))
+        elif kind == "bookmark":
+            index.add_bookmark(item["url"], item["title"])
+        elif kind == "clear":
+            index.clear_history()
+
+    def _on_loaded(self, index):
+        for kind, item in self._replay:
+            self._apply(index, kind, item)
+        self._replay = []
+        self.index = index
+        self.loader = None
+
+    def complete(self, text, limit=8):
+        return self.index.complete(text, limit)
+
+_service = None
+
+def completion_service():
+    """The shared completion service, created on first use (needs a running QApplication)."""
+    global _service
+    if _service is None:
+        _service = CompletionService(QCoreApplication.instance())
+    return _service
+
+class Omnibox(QObject):
+    """Frecency suggestions under a QLineEdit; picking one navigates to it.
+
+    Owns the line edit's Return handling too: with a suggestion highlighted
+    the line edit sees Return before the completer, and both would navigate.
+    """
+
+    MAX_SUGGESTIONS = 8
+
+    def __init__(self, line_edit, on_navigate):
+        super().__init__(line_edit)
+        self.line_edit = line_edit
+        self.on_navigate = on_navigate
+        self.service = completion_service()
+
+        self.model = QStandardItemModel(self)
+        self.completer = QCompleter(self.model, self)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.setCompletionRole(URL_ROLE)
+        self.completer.setMaxVisibleItems(self.MAX_SUGGESTIONS)
+        self.completer.setWidget(line_edit)
+        self.completer.activated[str].connect(self._on_activated)
+        line_edit.returnPressed.connect(self._on_return)
+        # textEdited only fires for typing, not for the tab's URL being shown
+        line_edit.textEdited.connect(self.update_suggestions)
+
+    def update_suggestions(self, text):
+        self.model.clear()
+        for url, title in self.service.complete(text, self.MAX_SUGGESTIONS):
+            item = QStandardItem(f"{title}  —  {url}" if title else url)
+            item.setData(url, URL_ROLE)
+            self.model.appendRow(item)
+        if self.model.rowCount():
+            self.completer.complete()
+            # Nothing highlighted until the user picks a row: Return goes to the typed text
+            self.completer.popup().setCurrentIndex(QModelIndex())
+        else:
+            self.completer.popup().hide()
+
+    def _on_return(self):
+        popup = self.completer.popup()
+        if popup.isVisible() and popup.currentIndex().isValid():
+            return  # the completer's activated follows with the highlighted URL
+        self.on_navigate()
+
+    def _on_activated(self, url):
+        self.line_edit.setText(url)
+        self.on_navigate()
@@ -438,3 +438,72 @@ def get_new_tab_html():
     </body>
     </html>
     """
+
+def get_adblock_stats_body(stats):
+    # Everything below the heading; WebView swaps it in every few seconds
+    if not stats:
+        stats = {"requests": 0, "blocked": {}, "blocked_total": 0, "avg_latency_us": 0.0,
+                 "latency_buckets_us": [], "latency_histogram": [], "uptime_s": 0}
+    
+    blocked_rows = "".join(
+        f"<tr><td>{name}</td><td>{count}</td></tr>" for name, count in stats["blocked"].items()
+    )
+    
+    # Histogram rows: "< 5 µs", "< 10 µs", ..., ">= 5000 µs"
+    hist_rows = ""
+    bounds = stats["latency_buckets_us"]
+    total = max(1, stats["requests"])
+    for i, count in enumerate(stats["latency_histogram"]):
+        label = f"&lt; {bounds[i]} µs" if i < len(bounds) else f"&ge; {bounds[-1]} µs"
+        width = int(count * 100 / total)
+        hist_rows += f"<tr><td>{label}</td><td>{count}</td><td><div class='bar' style='width:{width}%'></div></td></tr>"
+    
+    cache_rows = "".join(
+        f"<tr><td>{name}</td><td>{c['hits']} hits / {c['misses']} misses</td><td>{c['hit_rate'] * 100:.1f}%</td></tr>"
+        for name, c in stats.get("caches", {}).items()
+    )
+    block_rate = stats["blocked_total"] * 100 / total
+    
+    return f"""
+        <div class="cards">
+            <div class="card"><div class="value">{stats["requests"]}</div><div class="label">Requests seen</div></div>
+            <div class="card"><div class="value">{stats["blocked_total"]}</div><div class="label">Blocked ({block_rate:.1f}%)</div></div>
+            <div class="card"><div class="value">{stats["avg_latency_us"]:.1f} µs</div><div class="label">Avg decision time</div></div>
+        </div>
+        <h2>Blocked by rule category</h2>
+        <table>{blocked_rows}</table>
+        <h2>Decision caches</h2>
+        <table>{cache_rows}</table>
+        <h2>Decision latency</h2>
+        <table>{hist_rows}</table>
+    """
+
+def get_adblock_stats_html(stats):
+    # Internal page (xenit://adblock): live numbers from the shared interceptor
+    return f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <title>XeNit Shield</title>
+        <style>
+            html, body {{ background-color: #09090b; color: #FAFAFA; font-family: 'Segoe UI', sans-serif; }}
+            body {{ max-width: 820px; margin: 40px auto; }}
+            h1 {{ color: #00F0FF; font-weight: 600; }}
+            h2 {{ color: #A1A1AA; font-size: 1rem; text-transform: uppercase; letter-spacing: 2px; margin-top: 32px; }}
+            .cards {{ display: flex; gap: 12px; }}
+            .card {{ flex: 1; background: #18181b; border: 1px solid #27272a; border-radius: 12px; padding: 16px; }}
+            .card .value {{ font-size: 1.8rem; color: #00F0FF; }}
+            .card .label {{ color: #71717a; font-size: 0.85rem; }}
+            table {{ width: 100%; border-collapse: collapse; }}
+            td {{ padding: 6px 8px; border-bottom: 1px solid #27272a; }}
+            td:first-child {{ color: #A1A1AA; width: 140px; }}
+            .bar {{ height: 10px; background: #00F0FF; border-radius: 5px; min-width: 1px; }}
+        </style>
+    </head>
+    <body>
+        <h1>XeNit Shield</h1>
+        <div id="stats">{get_adblock_stats_body(stats)}</div>
+    </body>
+    </html>
+    """
@@ -0,0 +1,91 @@
+import os
+
+# Chromium only reads its flags once, when Qt WebEngine starts up, so a
+# profile has to be applied before the QApplication exists and changing it
+# takes a restart.
+PROFILES = {
+    "low-memory": {
+        "label": "Low memory",
+        "description": "Few shared renderers, one raster thread, small cache, no pre-warmed tabs. Best on 4 GB machines.",
+        "flags": [
+            "--renderer-process-limit=3",
+            "--process-per-site",
+            "--num-raster-threads=1",
+            "--enable-low-end-device-mode",
+        ],
+        "http_cache_mb": 64,
+        "freeze_after_sec": 60,
+        "warm_tabs": 0,
+        "preload_tabs": 0,
+    },
+    "balanced": {
+        "label": "Balanced",
+        "description": "Chromium's defaults with a capped renderer count.",
+        "flags": [
+            "--renderer-process-limit=8",
+            "--num-raster-threads=2",
+        ],
+        "http_cache_mb": 256,
+        "freeze_after_sec": 5 * 60,
+        "warm_tabs": 2,
+        "preload_tabs": 6,
+    },
+    "max-throughput": {
+        "label": "Max throughput",
+        "description": "A renderer per site instance, more raster threads, no throttling of background tabs.",
+        "flags": [
+            "--num-raster-threads=4",
+            "--disable-background-timer-throttling",
+            "--disable-renderer-backgrounding",
+            "--disable-backgrounding-occluded-windows",
+        ],
+        "http_cache_mb": 1024,
+        "freeze_after_sec": 15 * 60,
+        "warm_tabs": 3,
+        "preload_tabs": 12,
+    },
+}
+
+DEFAULT_PROFILE = "balanced"
+SETTING_KEY = "performance_profile"
+
+_active = DEFAULT_PROFILE
+
+def profile_from_args(argv):
+    """Takes --perf-profile NAME / --perf-profile=NAME out of argv. Returns NAME or None."""
+    for i, arg in enumerate(argv):
+        if arg.startswith("--perf-profile="):
+            del argv[i]
+            return arg.split("=", 1)[1]
+        if arg == "--perf-profile" and i + 1 < len(argv):
+            name = argv[i + 1]
+            del argv[i:i + 2]
+            return name
+    return None
+
+def apply_performance_profile(argv, saved=None):
+    """Picks the profile (command line, then saved setting, then default) and
+    puts its flags into QTWEBENGINE_CHROMIUM_FLAGS. Call before QApplication.
+
+    Flags already in the environment are kept after the profile's, so they win.
+    """
+    global _active
+    name = profile_from_args(argv) or saved or DEFAULT_PROFILE
+    if name not in PROFILES:
+        print(f"XeNit Performance: Unknown profile '{name}', using '{DEFAULT_PROFILE}'")
+        name = DEFAULT_PROFILE
+    _active = name
+
+    existing = os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", "").split()
+    flags = [f for f in PROFILES[name]["flags"] if f.split("=", 1)[0] not in
+             {e.split("=", 1)[0] for e in existing}]
+    os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = " ".join(flags + existing)
+    print(f"XeNit Performance: Profile '{name}' ({' '.join(flags) or 'no extra flags'})")
+    return name
+
+def active_profile():
+    """Name of the profile this run started with."""
+    return _active
+
+def active_settings():
+    return PROFILES[_active]
@@ -0,0 +1,110 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+class WriteBehind:
+    """Shared write-behind service: callers hand over data, a background thread writes it.
+
+    Pending writes are keyed by path, so any number of changes to one file
+    within FLUSH_INTERVAL_SEC cost a single write. Every file is replaced
+    atomically (temp file, fsync, rename). Whatever is still pending is
+    written out at interpreter exit.
+
+    Data is encoded to JSON in schedule(), on the caller's thread, so the
+    writer only ever sees a finished snapshot and owners can keep changing
+    their dicts and lists. The slow part (the disk write and fsync) stays on
+    the writer thread.
+    """
+    _instance = None
+
+    FLUSH_INTERVAL_SEC = 2.0
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(WriteBehind, cls).__new__(cls)
+            cls._instance.init_writer()
+        return cls._instance
+
+    def init_writer(self):
+        self._pending = {}   # path -> encoded text
+        self._cond = threading.Condition()
+        # Held while a batch is taken and written, so batches hit the disk in order
+        self._io_lock = threading.Lock()
+        self._stopped = False
+        self.writes = 0
+        self._thread = threading.Thread(target=self._run, name="XeNitWriteBehind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def schedule(self, path, data, indent=None):
+        """Queues data (JSON-serialisable, or a ready str) to replace the file at path."""
+        text = self._encode(path, data, indent)
+        if text is None:
+            return
+        with self._cond:
+            # Only the first pending write wakes the writer, the rest join its batch
+            if not self._pending:
+                self._cond.notify()
+            self._pending[path] = text
+            stopped = self._stopped
+        if stopped:
+            self.flush()  # shutting down, nobody else will write it
+
+    def flush(self):
+        """Writes everything pending now, on the calling thread."""
+        with self._io_lock:
+            with self._cond:
+                batch, self._pending = self._pending, {}
+            self._write_batch(batch)
+
+    def close(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return  # close() writes the rest
+                # Let further changes pile up until the deadline (close() cuts this short)
+                deadline = time.monotonic() + self.FLUSH_INTERVAL_SEC
+                while not self._stopped:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopped:
+                    return
+            self.flush()
+
+    def _write_batch(self, batch):
+        for path, text in batch.items():
+            self._write(path, text)
+
+    def _encode(self, path, data, indent):
+        if isinstance(data, str):
+            return data
+        try:
+            return json.dumps(data, indent=indent)
+        except (TypeError, ValueError) as e:
+            print(f"XeNit Persistence: Can't encode {os.path.basename(path)}: {e}")
+            return None
+
+    def _write(self, path, text):
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self.writes += 1
+        except OSError as e:
+            print(f"XeNit Persistence: Save of {path} failed: {e}")
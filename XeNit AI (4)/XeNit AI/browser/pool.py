@@ -0,0 +1,122 @@
+import time
+from PyQt6.QtCore import QObject, QTimer, QUrl, QEvent
+from browser.engine import WebView
+from browser.performance import active_settings
+
+NEW_TAB_URL = QUrl("xenit://newtab")
+
+class FirstPaintProbe(QObject):
+    """Catches the first paint of a view's loaded page on its render widget.
+
+    Measured the same way for every tab: once the page has finished loading
+    (pooled views already have), the next Paint event on the widget Chromium
+    draws into is the first time the page is on screen.
+    """
+
+    def __init__(self, view, loaded, on_painted):
+        super().__init__(view)
+        self.view = view
+        self.on_painted = on_painted
+        if loaded:
+            self._arm()
+        else:
+            view.loadFinished.connect(self._on_load)
+
+    def _on_load(self, ok):
+        self.view.loadFinished.disconnect(self._on_load)
+        self._arm()
+
+    def _arm(self):
+        self.target = self.view.focusProxy() or self.view
+        self.target.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.target and event.type() == QEvent.Type.Paint:
+            obj.removeEventFilter(self)
+            self.on_painted()
+            self.deleteLater()
+        return False
+
+class WebViewPool(QObject):
+    """A few hidden WebViews with the new-tab page already loaded.
+
+    New tabs take one instantly instead of building a view and rendering the
+    (WebGL-heavy) new-tab page on the spot; the pool refills once things are idle.
+    Time to first paint is recorded for pooled ("warm") and fresh ("cold") tabs.
+    The pool size comes from the performance profile (none for low-memory).
+    """
+
+    SIZE = 2
+    REFILL_DELAY_MS = 2000  # wait for the UI to settle before building the next view
+
+    def __init__(self, tab_widget, size=None):
+        super().__init__(tab_widget)
+        self.size = active_settings().get("warm_tabs", self.SIZE) if size is None else size
+        self._views = []   # [WebView] warming up or ready
+        self._ready = set()
+        self.paint_times = {"warm": [], "cold": []}  # ms, most recent last
+
+        self._refill_timer = QTimer(self)
+        self._refill_timer.setSingleShot(True)
+        self._refill_timer.setInterval(self.REFILL_DELAY_MS)
+        self._refill_timer.timeout.connect(self.refill)
+        self._refill_timer.start()
+
+    def take(self):
+        """Returns a pre-warmed view (new-tab page loaded), or None if none is ready."""
+        view = None
+        for candidate in self._views:
+            if candidate in self._ready:
+                view = candidate
+                break
+        if view is not None:
+            self._views.remove(view)
+            self._ready.discard(view)
+        self._refill_timer.start()
+        return view
+
+    def refill(self):
+        # One view per idle tick, so refilling never causes a visible hitch
+        if len(self._views) >= self.size:
+            return
+        # Hidden child of the tab widget: owned (and freed) with it, never painted until used
+        view = WebView(-1, self.parent())
+        view.hide()
+        view.loadFinished.connect(lambda ok, view=view: self._ready.add(view) if ok and view in self._views else None)
+        view.load_internal(NEW_TAB_URL)
+        self._views.append(view)
+        if len(self._views) < self.size:
+            self._refill_timer.start()
+
+    def clear(self):
+        self._refill_timer.stop()
+        for view in self._views:
+            view.deleteLater()
+        self._views = []
+        self._ready.clear()
+
+    def shrink(self, level):
+        # Memory governor relief: warm views each hold a renderer; refilled on the next take()
+        self.clear()
+
+    def track_first_paint(self, view, started, kind):
+        """Records request -> first paint for a new tab; started is a perf_counter() stamp."""
+        def painted():
+            ms = (time.perf_counter() - started) * 1000
+            times = self.paint_times[kind]
+            times.append(ms)
+            del times[:-50]
+            print(f"XeNit Pool: New tab painted in {ms:.0f} ms ({kind})")
+
+        FirstPaintProbe(view, kind == "warm", painted)
+
+    def stats(self):
+        """Average/last time to first paint per kind, in ms."""
+        result = {"pooled": len(self._ready), "size": self.size}
+        for kind, times in self.paint_times.items():
+            result[kind] = {
+                "count": len(times),
+                "avg_ms": sum(times) / len(times) if times else 0.0,
+                "last_ms": times[-1] if times else 0.0,
+            }
+        return result
@@ -0,0 +1,100 @@
+import os
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def read_process(pid):
+    """(cpu seconds used, resident bytes) of a process, or None if it can't be read."""
+    if not pid:
+        return None
+    try:
+        if psutil is not None:
+            proc = psutil.Process(pid)
+            cpu = proc.cpu_times()
+            return cpu.user + cpu.system, proc.memory_info().rss
+        with open(f"/proc/{pid}/stat", 'r') as f:
+            # Fields after the "(comm)" part; utime and stime are the 12th and 13th
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open(f"/proc/{pid}/statm", 'r') as f:
+            rss_pages = int(f.read().split()[1])
+        return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS, rss_pages * _PAGE_SIZE
+    except Exception:
+        # Process gone, no /proc (Windows without psutil), or access denied
+        return None
+
+def process_footprint(pid):
+    """Bytes a process accounts for on its own, or None if it can't be read.
+
+    PSS where the OS reports it (shared pages split between the processes
+    mapping them), else USS (private pages only), else plain RSS. Summed over
+    Chromium's processes, RSS counts the shared libraries and shared memory
+    once per renderer and grows with the tab count even when nothing changed.
+    """
+    if psutil is not None:
+        try:
+            proc = psutil.Process(pid)
+            try:
+                full = proc.memory_full_info()
+                return getattr(full, "pss", None) or full.uss
+            except psutil.AccessDenied:
+                return proc.memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", 'r') as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass  # kernel before 4.14, or not Linux
+    info = read_process(pid)
+    return info[1] if info is not None else None
+
+def process_tree_memory():
+    """process_footprint() of this process plus all its descendants (renderers, GPU, zygote).
+
+    None when it can't be measured.
+    """
+    root = os.getpid()
+    if psutil is not None:
+        try:
+            pids = [root] + [child.pid for child in psutil.Process(root).children(recursive=True)]
+        except psutil.Error:
+            return None
+        # A child that exited meanwhile just doesn't count
+        return sum(process_footprint(pid) or 0 for pid in pids)
+    if not os.path.isdir("/proc"):
+        return None
+    # 1. Parent -> children map from every /proc/<pid>/stat
+    children = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", 'r') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+    # 2. Walk down from ourselves
+    total = 0
+    pending = [root]
+    while pending:
+        pid = pending.pop()
+        total += process_footprint(pid) or 0
+        pending.extend(children.get(pid, ()))
+    return total
+
+def physical_memory():
+    """Total RAM in bytes, or 0 if unknown."""
+    if psutil is not None:
+        return psutil.virtual_memory().total
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * _PAGE_SIZE
+    except (AttributeError, ValueError, OSError):
+        return 0
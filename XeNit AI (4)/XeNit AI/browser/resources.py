@@ -0,0 +1,139 @@
+import time
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from browser.adblock import adblock_site_counts
+from browser.filters import base_domain
+from browser.procinfo import read_process
+
+# Bytes this document pulled over the network, as the page itself saw them.
+# Cross-origin resources without Timing-Allow-Origin report 0, so it is a floor.
+TRANSFER_BYTES_JS = """
+(function() {
+    let total = 0;
+    for (const e of performance.getEntriesByType('navigation')) total += e.transferSize || 0;
+    for (const e of performance.getEntriesByType('resource')) total += e.transferSize || 0;
+    return total;
+})();
+"""
+
+class ResourceMonitor(QObject):
+    """Samples per-tab CPU, memory and network use for the task manager.
+
+    Renderer numbers come from the tab's render process (/proc or psutil). Tabs
+    that share a renderer split its numbers evenly. Request counts come from the
+    ad-block interceptor, per first-party site (the interceptor can't tell
+    which tab a request came from), so every tab of a site shows the site's
+    totals. Transfer sizes are read from the page's Performance API.
+
+    Nothing reads the samples unless a task manager is open, so the timer
+    only runs between add_viewer() and the matching remove_viewer();
+    sample() can still be called directly at any time.
+    """
+    sampled = pyqtSignal()
+
+    INTERVAL_MS = 2000
+
+    def __init__(self, tab_manager):
+        super().__init__(tab_manager)
+        self.tabs = tab_manager
+        self.viewers = 0
+        self.rows = []
+        self._cpu = {}     # pid -> (monotonic time, cpu seconds) from the previous sample
+        self._bytes = {}   # view -> last transfer size seen
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.INTERVAL_MS)
+        self.timer.timeout.connect(self.sample)
+
+    def add_viewer(self):
+        self.viewers += 1
+        if self.viewers == 1:
+            self.timer.start()
+        self.sample()
+
+    def remove_viewer(self):
+        self.viewers = max(0, self.viewers - 1)
+        if self.viewers == 0:
+            self.timer.stop()
+
+    def sample(self):
+        now = time.monotonic()
+        views = []
+        for i in range(self.tabs.count()):
+            widget = self.tabs.widget(i)
+            if hasattr(widget, 'url') and callable(widget.url):
+                views.append(widget)
+
+        # 1. One /proc read per renderer, however many tabs share it
+        by_pid = {}
+        for view in views:
+            pid = view.page().renderProcessPid() if hasattr(view, 'page') else 0
+            by_pid.setdefault(pid, []).append(view)
+        process = {}
+        for pid in by_pid:
+            info = read_process(pid)
+            if info is None:
+                continue
+            cpu_seconds, rss = info
+            prev = self._cpu.get(pid)
+            cpu_percent = 0.0
+            if prev is not None and now > prev[0]:
+                cpu_percent = max(0.0, (cpu_seconds - prev[1]) / (now - prev[0]) * 100)
+            self._cpu[pid] = (now, cpu_seconds)
+            process[pid] = (cpu_percent, rss)
+        for pid in list(self._cpu):
+            if pid not in process:
+                del self._cpu[pid]
+
+        # 2. Requests per site from the interceptor
+        site_counts = {}
+        profiles = [v.profile for v in views if hasattr(v, 'profile')]
+        if profiles:
+            site_counts = adblock_site_counts(profiles[0])
+
+        rows = []
+        for view in views:
+            host = view.url().host().lower().rstrip('.')
+            site = base_domain(host) if host else view.url().scheme()
+            pid = view.page().renderProcessPid() if hasattr(view, 'page') else 0
+            sharing = len(by_pid.get(pid, ())) or 1
+            cpu_percent, rss = process.get(pid, (0.0, 0))
+            if hasattr(view, 'page'):
+                state = self.tabs.lifecycle.state(view)["state"]
+                if self.viewers and state == "active":
+                    view.page().runJavaScript(TRANSFER_BYTES_JS, lambda n, view=view: self._store_bytes(view, n))
+            else:
+                state = "unloaded"
+            requests, blocked = site_counts.get(site, (0, 0))
+            rows.append({
+                "views": [view],
+                "title": view.title() or view.url().toString(),
+                "site": site,
+                "state": state,
+                "pid": pid,
+                "shared": sharing,
+                "cpu": cpu_percent / sharing,
+                "rss": rss / sharing,
+                "bytes": self._bytes.get(view, 0),
+                "requests": requests,
+                "blocked": blocked,
+            })
+        self._bytes = {view: n for view, n in self._bytes.items() if view in views}
+        self.rows = rows
+        self.sampled.emit()
+
+    def _store_bytes(self, view, total):
+        if isinstance(total, (int, float)):
+            self._bytes[view] = int(total)
+
+    def site_rows(self):
+        """self.rows aggregated per site (site request counts are already per site)."""
+        sites = {}
+        for row in self.rows:
+            agg = sites.get(row["site"])
+            if agg is None:
+                agg = sites[row["site"]] = dict(row, title=row["site"], views=[], cpu=0.0, rss=0, bytes=0)
+            agg["views"] += row["views"]
+            agg["cpu"] += row["cpu"]
+            agg["rss"] += row["rss"]
+            agg["bytes"] += row["bytes"]
+        return list(sites.values())
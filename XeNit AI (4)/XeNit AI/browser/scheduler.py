@@ -0,0 +1,157 @@
+import time
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEnginePage
+from PyQt6 import sip
+
+# Lower runs first
+PRIORITY_ACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_PRELOAD = 2
+
+class LoadScheduler(QObject):
+    """Decides when a tab's navigation actually starts.
+
+    The current tab always loads immediately. Background tabs share a small
+    number of load slots (fewer while the current tab is itself loading);
+    the rest wait in a queue where every AGING_SEC of waiting raises a
+    request's priority by one step, so preloads can't starve forever.
+    """
+    status_changed = pyqtSignal(object, str)  # view, "queued" / "loading" / ""
+
+    MAX_BACKGROUND_LOADS = 3
+    MAX_BACKGROUND_LOADS_BUSY = 1  # while the active tab is loading
+    AGING_SEC = 5.0
+    STALL_SEC = 30.0  # a background load that hasn't finished by then gives its slot back
+
+    def __init__(self, tab_manager):
+        super().__init__(tab_manager)
+        self.tabs = tab_manager
+        self._queue = []       # [(priority, enqueued_at, view, qurl)]
+        self._running = {}     # view -> (started_at, qurl), background loads only
+        self._active_loading = None  # (view, started_at, qurl) of the current tab's load
+        self._hooked = set()
+
+        self.tabs.currentChanged.connect(self._on_current_changed)
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.pump)
+
+    def load(self, view, qurl, priority=PRIORITY_BACKGROUND):
+        """Loads qurl in view now if it is the current tab or a slot is free, else queues it."""
+        self._dequeue(view)
+        if view is self.tabs.currentWidget():
+            self._start(view, qurl, background=False)
+            return
+        self._queue.append((priority, time.monotonic(), view, qurl))
+        self._hook(view)
+        self.pump()
+
+    def _hook(self, view):
+        if view in self._hooked:
+            return
+        self._hooked.add(view)
+        view.loadFinished.connect(lambda ok, view=view: self._finished(view))
+        view.destroyed.connect(lambda *_, view=view: self._forget(view))
+
+    def position(self, view):
+        """1-based place of view in the queue (by current effective priority), or 0."""
+        for i, entry in enumerate(self._ordered()):
+            if entry[2] is view:
+                return i + 1
+        return 0
+
+    def queued_count(self):
+        return len(self._queue)
+
+    def _effective(self, entry):
+        priority, enqueued_at, _view, _qurl = entry
+        return priority - (time.monotonic() - enqueued_at) / self.AGING_SEC
+
+    def _ordered(self):
+        return sorted(self._queue, key=lambda e: (self._effective(e), e[1]))
+
+    def _capacity(self):
+        if self._active_loading is not None:
+            return self.MAX_BACKGROUND_LOADS_BUSY
+        return self.MAX_BACKGROUND_LOADS
+
+    def pump(self):
+        now = time.monotonic()
+        # Hung loads give their slot back
+        for view, (started, _qurl) in list(self._running.items()):
+            if now - started > self.STALL_SEC:
+                self._running.pop(view, None)
+                self.status_changed.emit(view, "")
+        if self._active_loading is not None and now - self._active_loading[1] > self.STALL_SEC:
+            self._active_loading = None
+
+        ordered = self._ordered()
+        while ordered and len(self._running) < self._capacity():
+            entry = ordered.pop(0)
+            self._queue.remove(entry)
+            self._start(entry[2], entry[3], background=True)
+
+        for entry in ordered:
+            self.status_changed.emit(entry[2], "queued")
+        if self._queue or self._running:
+            self.timer.start()
+        else:
+            self.timer.stop()
+
+    def _start(self, view, qurl, background):
+        page = view.page()
+        # A tab frozen while it waited must be thawed or the navigation stalls
+        if page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        self._hook(view)
+        if background:
+            self._running[view] = (time.monotonic(), qurl)
+            self.status_changed.emit(view, "loading")
+        else:
+            self._active_loading = (view, time.monotonic(), qurl)
+            self.status_changed.emit(view, "")
+        view.load(qurl)
+
+    def _finished(self, view):
+        if self._running.pop(view, None) is not None:
+            self.status_changed.emit(view, "")
+        if self._active_loading is not None and view is self._active_loading[0]:
+            self._active_loading = None
+        self.pump()
+
+    def _on_current_changed(self, index):
+        view = self.tabs.widget(index)
+        # A load the user just switched away from becomes a background load;
+        # with no slot left for it, it goes back to the queue
+        if self._active_loading is not None and self._active_loading[0] is not view:
+            previous, started, qurl = self._active_loading
+            self._active_loading = None
+            if len(self._running) < self._capacity():
+                self._running[previous] = (started, qurl)
+                self.status_changed.emit(previous, "loading")
+            else:
+                previous.stop()
+                self._queue.append((PRIORITY_BACKGROUND, time.monotonic(), previous, qurl))
+        # The tab the user is looking at jumps the queue
+        for entry in self._queue:
+            if entry[2] is view:
+                self._queue.remove(entry)
+                self._start(view, entry[3], background=False)
+                break
+        if view in self._running:
+            started, qurl = self._running.pop(view)
+            self._active_loading = (view, started, qurl)
+            self.status_changed.emit(view, "")
+        self.pump()
+
+    def _dequeue(self, view):
+        self._queue = [e for e in self._queue if e[2] is not view]
+
+    def _forget(self, view):
+        self._dequeue(view)
+        self._running.pop(view, None)
+        self._hooked.discard(view)
+        if self._active_loading is not None and view is self._active_loading[0]:
+            self._active_loading = None
+        if not sip.isdeleted(self):
+            QTimer.singleShot(0, self.pump)
@@ -0,0 +1,385 @@
+from PyQt6.QtWebEngineCore import QWebEngineScript
+
+class ContentScriptRegistry:
+    """Installs each content script exactly once per profile.
+
+    Scripts are deduplicated by name and replaced only when their version
+    changes, so creating tabs or windows never stacks duplicate copies.
+    Optional match patterns become a Greasemonkey header, which QtWebEngine
+    evaluates itself, so a site-specific script never runs anywhere else.
+    """
+    _registries = {}  # id(profile) -> registry
+
+    @classmethod
+    def for_profile(cls, profile):
+        registry = cls._registries.get(id(profile))
+        if registry is None:
+            registry = cls(profile)
+            cls._registries[id(profile)] = registry
+        return registry
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.installed = {}  # name -> version
+
+    def register(self, name, source, injection_point, matches=None, includes=None, excludes=None,
+                 version=1, world=QWebEngineScript.ScriptWorldId.MainWorld):
+        """Installs (or upgrades) a script. Returns False if this version is already in place."""
+        if self.installed.get(name) == version:
+            return False
+
+        # Drop any older copy, including ones inserted before the registry existed
+        scripts = self.profile.scripts()
+        for old in scripts.find(name):
+            scripts.remove(old)
+
+        if matches or includes or excludes:
+            # matches: Chrome match patterns (*://*.example.com/*), includes/excludes: globs
+            header = ["// ==UserScript==", f"// @name {name}"]
+            header += [f"// @match {pattern}" for pattern in matches or []]
+            header += [f"// @include {pattern}" for pattern in includes or []]
+            header += [f"// @exclude {pattern}" for pattern in excludes or []]
+            header.append("// ==/UserScript==")
+            source = "\n".join(header) + "\n" + source
+
+        script = QWebEngineScript()
+        script.setName(name)
+        script.setSourceCode(source)
+        script.setInjectionPoint(injection_point)
+        script.setWorldId(world)
+        scripts.insert(script)
+        self.installed[name] = version
+        return True
+
+# CSS Code for Cosmetic Filtering
+COSMETIC_CSS = """
+/* Generic Ad Hiding Rules */
+div[id^="google_ads_"], div[id*="google_ads_"],
+iframe[id^="google_ads_"], iframe[id*="google_ads_"],
+iframe[src*="doubleclick.net"], iframe[src*="googlesyndication.com"],
+.adsbygoogle, .google-auto-placed, .ad-banner, .banner-ad,
+.ad_unit, .ad-slot, .ad-wrapper, .ad-container,
+.text-ad, .sponsor-ad, .sponsored-link,
+a[href*="/ad/"], a[href*="doubleclick"],
+div[data-ad-unit], div[data-google-query-id] {
+    display: none !important;
+    visibility: hidden !important;
+    height: 0 !important;
+    width: 0 !important;
+    pointer-events: none !important;
+}
+"""
+
+# 1. EARLY SHIELD (DocumentCreation)
+# Prevents popups before page renders fully
+# ALSO: Spoofs navigator behavior to look like a real browser (not automation)
+EARLY_SHIELD_JS = """
+(function() {
+    try {
+        // 0. JSON INTERCEPTION (The "Forceful" Fix)
+        // YouTube delivers ad configurations in JSON blobs. We strip them out before the player sees them.
+        const originalParse = JSON.parse;
+        JSON.parse = function(text, reviver) {
+            const data = originalParse(text, reviver);
+            if (data && typeof data === 'object') {
+                // YouTube Ad Keys
+                if (data.adPlacements) {
+                    delete data.adPlacements;
+                    console.log('XeNit AdBlock: Stripped adPlacements');
+                }
+                if (data.playerAds) {
+                    delete data.playerAds;
+                    console.log('XeNit AdBlock: Stripped playerAds');
+                }
+            }
+            return data;
+        };
+
+        // 1. Strict Popup Blocker (Immediate)
+        window.open = function(url, target, features) {
+            console.log('XeNit AdBlock: Blocked Popup to ' + url);
+            return null;
+        };
+
+        // 2. STEALTH MODE: Anti-Detection Evasions
+
+        // A. Hide Webdriver (The biggest flag)
+        Object.defineProperty(navigator, 'webdriver', {
+            get: () => undefined
+        });
+
+        // B. Mock window.chrome (Required for Google Login)
+        if (!window.chrome) {
+            window.chrome = {
+                runtime: {},
+                loadTimes: function() {},
+                csi: function() {},
+                app: {}
+            };
+        }
+
+        // C. Mock Plugins (Empty plugins array triggers bots)
+        if (navigator.plugins.length === 0) {
+            Object.defineProperty(navigator, 'plugins', {
+                get: () => [1, 2, 3, 4, 5] // Dummy length to fool checks
+            });
+        }
+
+        // D. Mock Languages
+        Object.defineProperty(navigator, 'languages', {
+            get: () => ['en-US', 'en']
+        });
+
+        // E. Mock Permissions (Passes notification checks)
+        const originalQuery = window.navigator.permissions.query;
+        window.navigator.permissions.query = (parameters) => (
+            parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+        );
+
+        console.log('XeNit Stealth Mode: Active');
+
+    } catch (e) {
+        console.log('XeNit Stealth Error: ' + e);
+    }
+})();
+"""
+
+# 2. COSMETIC SHIELD (DocumentReady, every site)
+# Injects the ad-hiding CSS and ticks simple captcha checkboxes
+COSMETIC_SHIELD_JS = """
+(function() {
+    // 1. Cosmetic CSS Injection
+    const style = document.createElement('style');
+    style.type = 'text/css';
+    style.textContent = `""" + COSMETIC_CSS + """`;
+    (document.head || document.documentElement).appendChild(style);
+
+    // 2. CAPTCHA AUTO-SOLVER (Simple Checkboxes)
+    function cleanCaptcha() {
+        // Cloudflare Turnstile / Challenge
+        const cfBox = document.querySelector('#challenge-stage input[type="checkbox"]');
+        if (cfBox && !cfBox.checked) {
+            cfBox.click();
+            console.log("XeNit: Clicked Cloudflare Checkbox");
+        }
+
+        // Generic "I am human" buttons (careful selector)
+        const challenge = document.querySelector('#turnstile-wrapper iframe') || document.querySelector('.cf-turnstile iframe');
+        if (challenge) {
+            // We can't click INSIDE an iframe easily without logic in that frame.
+        }
+    }
+    // Challenges render late; poll briefly instead of forever
+    let attempts = 0;
+    cleanCaptcha();
+    const captchaTimer = setInterval(function() {
+        cleanCaptcha();
+        if (++attempts >= 20) clearInterval(captchaTimer);
+    }, 1000);
+})();
+"""
+
+# 3. YOUTUBE SWEEPER (DocumentReady, YouTube only)
+# Event driven: mutations are coalesced into one pass per animation frame and
+# only the added nodes are checked against one precompiled selector. A slow
+# fallback sweep backs off while nothing is found, and everything stops while
+# the tab is hidden.
+YOUTUBE_SWEEPER_JS = """
+(function() {
+    // Static Ad Containers (one combined selector, matched against added nodes only)
+    const AD_SELECTOR = [
+        'ytd-promoted-sparkles-web-renderer', 'ytd-display-ad-renderer',
+        'ytd-statement-banner-renderer', 'ytd-in-feed-ad-layout-renderer',
+        '#masthead-ad', 'ytd-banner-promo-renderer', '#player-ads',
+        '.ytd-merch-shelf-renderer', 'ytd-ad-slot-renderer',
+        'ytd-player-legacy-desktop-watch-ads-renderer',
+        'ytd-rich-item-renderer.ytd-ad-slot-renderer',
+        '.ytp-ad-overlay-container', '.ytp-ad-image-overlay'
+    ].join(',');
+    const SKIP_SELECTOR = '.ytp-ad-skip-button, .ytp-ad-skip-button-modern, .videoAdUiSkipButton, .ytp-ad-skip-button-slot';
+
+    const MIN_SWEEP_MS = 1000;
+    const MAX_SWEEP_MS = 8000;
+
+    let pendingNodes = [];
+    let frameRequested = false;
+    let sweepDelay = MIN_SWEEP_MS;
+    let sweepTimer = null;
+    let adTimer = null;
+    let playerObserver = null;
+    let observedPlayer = null;
+
+    function removeAd(el) {
+        el.style.display = 'none';
+        el.remove();
+    }
+
+    // Removes ads in (or under) the given root. Returns how many were removed.
+    function cleanNode(root) {
+        let removed = 0;
+        if (root.matches && root.matches(AD_SELECTOR)) {
+            removeAd(root);
+            return 1;
+        }
+        if (root.querySelectorAll) {
+            root.querySelectorAll(AD_SELECTOR).forEach(el => { removeAd(el); removed++; });
+        }
+        return removed;
+    }
+
+    // A. Video Ads (Skip, or Mute + Speed Up + Seek while one is playing)
+    function handleVideoAd() {
+        const player = document.querySelector('#movie_player');
+        const video = document.querySelector('video');
+        const adShowing = player && (player.classList.contains('ad-showing') || player.classList.contains('ad-interrupting'));
+
+        if (video && adShowing) {
+            const skipBtn = document.querySelector(SKIP_SELECTOR);
+            if (skipBtn) {
+                skipBtn.click();
+                console.log('XeNit AdBlock: Skipped Ad (Click)');
+            }
+            video.muted = true;
+            video.playbackRate = 16.0; // Fast forward
+            // Force seek to end
+            if (!isNaN(video.duration)) {
+                video.currentTime = video.duration;
+            }
+            // Keep nudging until the player drops its ad state
+            if (!adTimer) adTimer = setInterval(handleVideoAd, 250);
+        } else if (adTimer) {
+            clearInterval(adTimer);
+            adTimer = null;
+        }
+        return adShowing;
+    }
+
+    // The player toggles "ad-showing" on its own class list; watch just that attribute
+    function watchPlayer() {
+        const player = document.querySelector('#movie_player');
+        if (!player || player === observedPlayer) return;
+        if (playerObserver) playerObserver.disconnect();
+        observedPlayer = player;
+        playerObserver = new MutationObserver(handleVideoAd);
+        playerObserver.observe(player, { attributes: true, attributeFilter: ['class'] });
+    }
+
+    // B. Full pass: page-level chores that don't hang off a specific added node
+    function fullSweep() {
+        let found = cleanNode(document);
+        watchPlayer();
+        if (handleVideoAd()) found++;
+
+        // Force Autoplay Next (User Request "Activate Autopay")
+        const autoNav = document.querySelector('.ytp-autonav-toggle-button[aria-checked="false"]');
+        if (autoNav) {
+            autoNav.click();
+            console.log('XeNit: Enabled Autoplay Next');
+        }
+
+        // Auto-Close Consent Popups (if any)
+        const consent = document.querySelector('button[aria-label^="Accept"]');
+        if (consent) consent.click();
+
+        // Force play main video if it's paused at the start (and not an ad)
+        const video = document.querySelector('video');
+        if (video && video.paused && !adTimer && video.currentTime < 2) {
+            video.play();
+            console.log('XeNit: Force Playing Video');
+        }
+        return found;
+    }
+
+    // Fallback sweep with idle backoff: 1s, 2s, 4s, 8s while nothing turns up
+    function scheduleSweep() {
+        clearTimeout(sweepTimer);
+        sweepTimer = setTimeout(function() {
+            if (fullSweep() > 0) {
+                sweepDelay = MIN_SWEEP_MS;
+            } else {
+                sweepDelay = Math.min(sweepDelay * 2, MAX_SWEEP_MS);
+            }
+            scheduleSweep();
+        }, sweepDelay);
+    }
+
+    // C. Mutations: batch added nodes, process once per animation frame
+    function flush() {
+        frameRequested = false;
+        const nodes = pendingNodes;
+        pendingNodes = [];
+        let found = 0;
+        for (const node of nodes) {
+            if (node.isConnected) found += cleanNode(node);
+        }
+        watchPlayer();
+        if (found > 0) {
+            sweepDelay = MIN_SWEEP_MS;
+            scheduleSweep();
+        }
+    }
+
+    const observer = new MutationObserver(function(mutations) {
+        for (const m of mutations) {
+            for (const node of m.addedNodes) {
+                if (node.nodeType === 1) pendingNodes.push(node);
+            }
+        }
+        if (pendingNodes.length && !frameRequested) {
+            frameRequested = true;
+            requestAnimationFrame(flush);
+        }
+    });
+
+    function start() {
+        observer.observe(document.documentElement, { childList: true, subtree: true });
+        sweepDelay = MIN_SWEEP_MS;
+        fullSweep();
+        scheduleSweep();
+    }
+
+    function stop() {
+        observer.disconnect();
+        if (playerObserver) playerObserver.disconnect();
+        observedPlayer = null;
+        clearTimeout(sweepTimer);
+        clearInterval(adTimer);
+        sweepTimer = adTimer = null;
+        pendingNodes = [];
+    }
+
+    // D. Background tabs do no work at all
+    document.addEventListener('visibilitychange', function() {
+        if (document.hidden) stop(); else start();
+    });
+
+    // SPA navigation: re-check right away instead of waiting for the backoff
+    window.addEventListener('yt-navigate-finish', function() {
+        if (document.hidden) return;
+        sweepDelay = MIN_SWEEP_MS;
+        fullSweep();
+        scheduleSweep();
+    });
+
+    if (!document.hidden) start();
+    console.log('XeNit AdBlock: Event-Driven Sweeper Active');
+})();
+"""
+
+# YouTube hosts, plus the FQDN form used by the "dot trick" (not a valid match pattern)
+YOUTUBE_MATCHES = ["*://*.youtube.com/*"]
+YOUTUBE_INCLUDES = ["*://*.youtube.com./*"]
+
+def install_shield_scripts(profile):
+    """Registers XeNit's shield scripts on the profile (no-op after the first call)."""
+    registry = ContentScriptRegistry.for_profile(profile)
+    registry.register("XeNitShieldStart", EARLY_SHIELD_JS,
+                      QWebEngineScript.InjectionPoint.DocumentCreation)
+    registry.register("XeNitShieldEnd", COSMETIC_SHIELD_JS,
+                      QWebEngineScript.InjectionPoint.DocumentReady)
+    registry.register("XeNitYouTubeSweeper", YOUTUBE_SWEEPER_JS,
+                      QWebEngineScript.InjectionPoint.DocumentReady,
+                      matches=YOUTUBE_MATCHES, includes=YOUTUBE_INCLUDES)
+    return registry
@@ -0,0 +1,196 @@
+import atexit
+import queue
+import re
+import sqlite3
+import threading
+
+# One row per distinct URL. page_text is a plain FTS5 table sharing its rowid,
+# so page text is stored once (inside the index) and snippets still work.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    last_visit TEXT NOT NULL DEFAULT '',
+    visit_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS page_text USING fts5(
+    title, url, body,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+"""
+
+# Column weights for bm25(): a hit in the title beats one in the URL beats one in the text
+RANK = "bm25(page_text, 10.0, 4.0, 1.0)"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# Left out of agent retrieval queries, they match everything
+_STOPWORDS = {
+    "the", "and", "for", "you", "are", "was", "what", "this", "that", "with", "from",
+    "how", "why", "who", "can", "did", "does", "about", "have", "has", "tell", "show",
+    "find", "page", "pages", "please", "there", "their", "which", "when", "where",
+}
+
+def fts_query(text, match_all=True, max_terms=8):
+    """Turns free text into a safe FTS5 query: every word quoted and prefix-matched."""
+    words = _WORD_RE.findall(text.lower())
+    if not match_all:
+        words = [w for w in words if len(w) > 2 and w not in _STOPWORDS]
+    words = list(dict.fromkeys(words))[:max_terms]
+    if not words:
+        return ""
+    return (" AND " if match_all else " OR ").join('"%s"*' % w for w in words)
+
+class SearchIndex:
+    """Full-text index (SQLite FTS5) over visited pages: title, URL and extracted text.
+
+    Updates are queued to a background thread that applies them in batches on
+    its own connection; searches run on the caller's connection and only read,
+    which WAL lets them do while the indexer writes.
+    """
+
+    BATCH_SIZE = 200
+    # Ranking is only done over the newest this-many matches, so a word that
+    # appears on every page still answers in milliseconds
+    MAX_CANDIDATES = 2000
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        self.db.commit()
+
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="XeNitSearchIndexer", daemon=True)
+        self._thread.start()
+        # Visits recorded from here on are indexed one by one, older ones in bulk
+        has_visits = self.db.execute("SELECT 1 FROM sqlite_master WHERE name = 'visits'").fetchone()
+        last_visit_id = self.db.execute("SELECT MAX(id) FROM visits").fetchone()[0] if has_visits else None
+        if last_visit_id:
+            self._jobs.put(("backfill", last_visit_id))
+        atexit.register(self.close)
+
+    # --- Updates (any thread, applied in the background) ---
+
+    def index_visit(self, url, title, timestamp):
+        self._jobs.put(("visit", url, title or "", timestamp))
+
+    def index_text(self, url, title, text):
+        if url.startswith(("http://", "https://")) and text:
+            self._jobs.put(("text", url, title or "", text))
+
+    def clear(self):
+        self._jobs.put(("clear",))
+
+    def close(self):
+        if self._thread.is_alive():
+            self._jobs.put(None)
+            self._thread.join(timeout=5)
+
+    # --- Queries ---
+
+    def search(self, text, limit=50, match_all=True):
+        """Best matches first: [{url, title, last_visit, snippet}]. Words are prefix-matched."""
+        query = fts_query(text, match_all)
+        if not query:
+            return []
+        try:
+            # 1. Lowest rowid among the newest MAX_CANDIDATES matches (walks the index in rowid order, cheap)
+            row = self.db.execute(
+                "SELECT rowid FROM page_text WHERE page_text MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                (query, self.MAX_CANDIDATES - 1)).fetchone()
+            floor = row[0] if row else 0
+            # 2. bm25 over those
+            rows = self.db.execute(
+                "SELECT pages.url, pages.title, pages.last_visit, "
+                "snippet(page_text, 2, '', '', '…', 14) "
+                "FROM page_text JOIN pages ON pages.id = page_text.rowid "
+                f"WHERE page_text MATCH ? AND page_text.rowid >= ? ORDER BY {RANK} LIMIT ?",
+                (query, floor, limit)).fetchall()
+        except sqlite3.Error as e:
+            print(f"XeNit Search: Query failed: {e}")
+            return []
+        return [{"url": url, "title": title, "last_visit": last_visit, "snippet": snippet}
+                for url, title, last_visit, snippet in rows]
+
+    # --- Indexer thread ---
+
+    def _run(self):
+        db = sqlite3.connect(self.db_path)
+        db.execute("PRAGMA synchronous=NORMAL")
+        while True:
+            jobs = [self._jobs.get()]
+            # Drain whatever else is waiting into the same transaction
+            while len(jobs) < self.BATCH_SIZE:
+                try:
+                    jobs.append(self._jobs.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in jobs
+            try:
+                with db:
+                    for job in jobs:
+                        if job is not None:
+                            getattr(self, "_apply_" + job[0])(db, *job[1:])
+            except sqlite3.Error as e:
+                print(f"XeNit Search: Indexing failed: {e}")
+            if stop:
+                db.close()
+                return
+
+    def _apply_backfill(self, db, last_visit_id):
+        # First run with an existing history: one row per URL, latest title wins
+        if db.execute("SELECT 1 FROM pages LIMIT 1").fetchone():
+            return
+        db.execute(
+            "INSERT INTO pages (url, title, last_visit, visit_count) "
+            "SELECT url, title, MAX(timestamp), COUNT(*) FROM visits WHERE id <= ? GROUP BY url",
+            (last_visit_id,))
+        db.execute("INSERT INTO page_text (rowid, title, url, body) SELECT id, title, url, '' FROM pages")
+        count = db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        if count:
+            print(f"XeNit Search: Indexed {count} pages from history")
+
+    def _apply_visit(self, db, url, title, timestamp):
+        row = db.execute("SELECT id, title FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            cursor = db.execute("INSERT INTO pages (url, title, last_visit, visit_count) VALUES (?, ?, ?, 1)",
+                                (url, title, timestamp))
+            db.execute("INSERT INTO page_text (rowid, title, url, body) VALUES (?, ?, ?, '')",
+                       (cursor.lastrowid, title, url))
+            return
+        page_id, old_title = row
+        title = title or old_title
+        db.execute("UPDATE pages SET title = ?, last_visit = ?, visit_count = visit_count + 1 WHERE id = ?",
+                   (title, timestamp, page_id))
+        if title != old_title:
+            self._replace_text(db, page_id, title, url, None)
+
+    def _apply_text(self, db, url, title, text):
+        row = db.execute("SELECT id, title FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            # Extracted before the visit was recorded (or a page kept out of history)
+            cursor = db.execute("INSERT INTO pages (url, title) VALUES (?, ?)", (url, title))
+            db.execute("INSERT INTO page_text (rowid, title, url, body) VALUES (?, ?, ?, ?)",
+                       (cursor.lastrowid, title, url, text))
+            return
+        page_id, old_title = row
+        title = title or old_title
+        if title != old_title:
+            db.execute("UPDATE pages SET title = ? WHERE id = ?", (title, page_id))
+        self._replace_text(db, page_id, title, url, text)
+
+    def _replace_text(self, db, page_id, title, url, body):
+        # FTS5 rows can't be updated in place cheaply: delete and re-add (body None = keep it)
+        if body is None:
+            row = db.execute("SELECT body FROM page_text WHERE rowid = ?", (page_id,)).fetchone()
+            body = row[0] if row else ""
+        db.execute("DELETE FROM page_text WHERE rowid = ?", (page_id,))
+        db.execute("INSERT INTO page_text (rowid, title, url, body) VALUES (?, ?, ?, ?)",
+                   (page_id, title, url, body))
+
+    def _apply_clear(self, db):
+        db.execute("DELETE FROM pages")
+        db.execute("DELETE FROM page_text")
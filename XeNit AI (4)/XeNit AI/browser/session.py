@@ -0,0 +1,218 @@
+import json
+import os
+from PyQt6.QtCore import QTimer, QUrl, QCoreApplication
+from browser.persistence import WriteBehind
+
+SESSION_VERSION = 1
+# Back/forward entries kept per tab
+MAX_HISTORY_ENTRIES = 25
+SAVE_DELAY_MS = 1500
+
+def _entry(item):
+    return [item.url().toString(), item.title()]
+
+def merge_history(entries, index, floor, session_back, session_forward):
+    """A tab's whole back and forward lists, restored entries around Chromium's.
+
+    entries are Chromium's [url, title] pairs with the current one at index.
+    Those below floor are left over from stepping into restored entries
+    (QWebEngineHistory.clear() keeps the current entry) and are already in the
+    session lists, so they are skipped.
+    """
+    back = list(session_back) + entries[floor:max(index, floor)]
+    forward = entries[index + 1:] + list(session_forward)
+    return back, forward
+
+def step_history(back, current, forward, direction):
+    """One step back (-1) or forward (+1) through merged lists.
+
+    Returns (target, new back, new forward); the current entry moves to the
+    side being left, so every entry stays exactly once.
+    """
+    if direction < 0:
+        return back[-1], back[:-1], [current] + forward
+    return forward[0], back + [current], forward[1:]
+
+def view_record(view):
+    """Snapshot of one live tab: url, title, back/forward entries, scroll offset."""
+    history = view.history()
+    index = history.currentItemIndex()
+    back, forward = merge_history([_entry(item) for item in history.items()], index,
+                                  view.history_floor, view.session_back, view.session_forward)
+    pos = view.page().scrollPosition()
+    # A background tab whose load is still queued has no URL yet
+    url = view.url() if not view.url().isEmpty() else view.pending_url
+    return {
+        "url": url.toString(),
+        "title": view.title(),
+        "back": back[-MAX_HISTORY_ENTRIES:],
+        "forward": forward[:MAX_HISTORY_ENTRIES],
+        "scroll": [int(pos.x()), int(pos.y())],
+    }
+
+def placeholder_record(placeholder):
+    # Never shown since restore: hand back what was restored, untouched
+    if placeholder.session:
+        return placeholder.session
+    return {"url": placeholder.url().toString(), "title": placeholder.title()}
+
+class SessionManager:
+    """Keeps ~/.xenit_browser/session.json in step with the open windows and tabs.
+
+    Each tab's record is encoded once and reused until that tab changes, and
+    saves are debounced, so a busy session with many tabs costs little. The file
+    is replaced atomically, a crash mid-write leaves the previous session intact.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(SessionManager, cls).__new__(cls)
+            cls._instance.init_session()
+        return cls._instance
+
+    def init_session(self):
+        self.base_dir = os.path.join(os.path.expanduser("~"), ".xenit_browser")
+        if not os.path.exists(self.base_dir):
+            os.makedirs(self.base_dir)
+        self.session_file = os.path.join(self.base_dir, "session.json")
+
+        self.windows = []
+        self._encoded = {}   # tab widget -> JSON text of its record
+        self._watched = set()
+        self._pending = self.load()  # window states not restored yet
+
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SAVE_DELAY_MS)
+        self._timer.timeout.connect(self.save)
+        QCoreApplication.instance().aboutToQuit.connect(self.save)
+
+    def load(self):
+        if not os.path.exists(self.session_file):
+            return []
+        try:
+            with open(self.session_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"XeNit Session: Could not read session ({e}), starting fresh")
+            return []
+        if data.get("version") != SESSION_VERSION:
+            return []
+        return [w for w in data.get("windows", []) if w.get("tabs")]
+
+    # --- Tracking ---
+
+    def register(self, window):
+        if window not in self.windows:
+            self.windows.append(window)
+
+    def window_closed(self, window):
+        # The last window closing means the app is quitting: keep its tabs for next time
+        others = [w for w in self.windows if w is not window and w.isVisible()]
+        if others:
+            self.windows.remove(window)
+            self.schedule_save()
+
+    def watch(self, view):
+        """Re-encodes a tab's record whenever it navigates, retitles or scrolls."""
+        if view in self._watched:
+            return
+        self._watched.add(view)
+        mark = lambda *_, view=view: self.mark_dirty(view)
+        view.urlChanged.connect(mark)
+        view.titleChanged.connect(mark)
+        view.page().scrollPositionChanged.connect(mark)
+        view.destroyed.connect(lambda *_, view=view: self._forget(view))
+
+    def mark_dirty(self, widget):
+        self._encoded.pop(widget, None)
+        self.schedule_save()
+
+    def schedule_save(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _forget(self, widget):
+        self._encoded.pop(widget, None)
+        self._watched.discard(widget)
+
+    # --- Snapshot ---
+
+    def _encode_tab(self, widget):
+        encoded = self._encoded.get(widget)
+        if encoded is None:
+            if hasattr(widget, 'history'):
+                record = view_record(widget)
+            elif hasattr(widget, 'session'):
+                record = placeholder_record(widget)
+            else:
+                return None  # the "+" tab
+            encoded = json.dumps(record, separators=(',', ':'))
+            self._encoded[widget] = encoded
+        return encoded
+
+    def _encode_window(self, window):
+        tabs = window.tabs
+        encoded_tabs = []
+        active = 0
+        for i in range(tabs.count()):
+            widget = tabs.widget(i)
+            encoded = self._encode_tab(widget)
+            if encoded is None:
+                continue
+            if widget is tabs.currentWidget():
+                active = len(encoded_tabs)
+            encoded_tabs.append(encoded)
+        return '{"active":%d,"tabs":[%s]}' % (active, ",".join(encoded_tabs))
+
+    def save(self):
+        self._timer.stop()
+        if not self.windows:
+            return
+        windows = ",".join(self._encode_window(w) for w in self.windows)
+        # Drop records of tabs that are gone (closed, or placeholders swapped for views)
+        live = {w.tabs.widget(i) for w in self.windows for i in range(w.tabs.count())}
+        self._encoded = {widget: text for widget, text in self._encoded.items() if widget in live}
+        payload = '{"version":%d,"windows":[%s]}' % (SESSION_VERSION, windows)
+        # Replaced atomically by the persistence thread
+        WriteBehind().schedule(self.session_file, payload)
+
+    # --- Restore ---
+
+    def restore_window(self, window):
+        """Rebuilds the next saved window's tabs into window. Returns False if nothing was saved.
+
+        Only the active tab is created and loaded; every other tab comes back as
+        a placeholder, so restoring a hundred tabs costs about as much as one.
+        """
+        self.register(window)
+        if not self._pending:
+            return False
+        state = self._pending.pop(0)
+        records = state["tabs"]
+        active = min(max(int(state.get("active", 0)), 0), len(records) - 1)
+
+        tabs = window.tabs
+        tabs.blockSignals(True)
+        for i, record in enumerate(records):
+            qurl = QUrl(record.get("url", ""))
+            title = (record.get("title") or "Restored")[:20]
+            if i == active:
+                view = window.add_new_tab(qurl, title)
+                view.restore_session(record)
+            else:
+                # Restored tabs stay unloaded until they are shown
+                placeholder = window.add_new_tab(qurl, title, background=True, preload=False)
+                placeholder.session = record
+        tabs.blockSignals(False)
+        tabs.setCurrentIndex(active)
+        tabs.currentChanged.emit(active)
+        print(f"XeNit Session: Restored {len(records)} tabs")
+        return True
+
+    def restore_remaining_windows(self, window_class):
+        """Opens a window for every saved window not restored yet."""
+        while self._pending:
+            window = window_class()
+            window.show()
@@ -1,12 +1,17 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QListWidget, QListWidgetItem, 
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QListView,
                              QTabWidget, QLabel, QTextEdit, QLineEdit, QPushButton, QHBoxLayout)
-from PyQt6.QtCore import Qt, QSize, pyqtSignal
-from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal
+from PyQt6.QtGui import QIcon, QTextCursor
+from browser.governor import memory_governor, LEVEL_TRIM, LEVEL_DROP_TEXT
+from browser.history_model import HistoryListModel, BookmarkListModel
 
 class AgentChatWidget(QWidget):
     voice_recognized = pyqtSignal(str)
     voice_error = pyqtSignal(str)
 
+    MAX_CHAT_BLOCKS = 2000
+    TRIMMED_CHAT_BLOCKS = 100
+
     def __init__(self, agent, browser_window, voice_manager=None):
         super().__init__()
         self.agent = agent
@@ -33,6 +38,9 @@ class AgentChatWidget(QWidget):
                 font-family: 'Segoe UI';
             }
         """)
+        # Oldest lines fall off the top once the chat gets this long (also turns off undo history)
+        self.chat_display.document().setMaximumBlockCount(self.MAX_CHAT_BLOCKS)
+        memory_governor().register("chat history", self.shrink_chat, LEVEL_TRIM, owner=self)
         layout.addWidget(self.chat_display)
         
         # Input Area
@@ -110,6 +118,14 @@ class AgentChatWidget(QWidget):
         self.add_message(text, is_user=True)
         self.input_field.clear()
         
+        # Page text not extracted yet (tab still settling): fetch it on demand first
+        current_browser = self.browser_window.tabs.currentWidget()
+        if hasattr(current_browser, 'extract_page_text') and not current_browser.last_extracted_text:
+            current_browser.extract_page_text(lambda _text: self.respond(text, via_voice))
+            return
+        self.respond(text, via_voice)
+
+    def respond(self, text, via_voice=False):
         # Get Context from Browser
         context = self.get_browser_context()
         if hasattr(self.browser_window, 'cleanup_proposal'):
@@ -132,6 +148,18 @@ class AgentChatWidget(QWidget):
         self.chat_display.append(f"{prefix} {text}\n")
         self.chat_display.verticalScrollBar().setValue(self.chat_display.verticalScrollBar().maximum())
 
+    def shrink_chat(self, level):
+        """Memory governor relief: keeps only the most recent part of the conversation."""
+        keep = self.TRIMMED_CHAT_BLOCKS if level >= LEVEL_DROP_TEXT else self.MAX_CHAT_BLOCKS // 2
+        document = self.chat_display.document()
+        excess = document.blockCount() - keep
+        if excess <= 0:
+            return
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        cursor.movePosition(QTextCursor.MoveOperation.NextBlock, QTextCursor.MoveMode.KeepAnchor, excess)
+        cursor.removeSelectedText()
+
     def get_browser_context(self):
         # Retrieve current tab details
         current_browser = self.browser_window.tabs.currentWidget()
@@ -181,13 +209,13 @@ class Sidebar(QWidget):
                 color: #00F0FF;
                 border-bottom: 2px solid #00F0FF;
             }
-            QListWidget {
+            QListView {
                 background-color: #09090b;
                 border: none;
                 outline: none;
                 padding: 10px;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 12px;
                 color: #FAFAFA;
                 border-radius: 8px;
@@ -195,7 +223,7 @@ class Sidebar(QWidget):
                 background-color: #18181b;
                 border: 1px solid #27272a;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #27272a;
                 border-color: #00F0FF;
             }
@@ -212,45 +240,67 @@ class Sidebar(QWidget):
             self.ai_widget = AgentChatWidget(self.agent, self.browser_window, self.voice_manager)
             self.tabs.addTab(self.ai_widget, "AI Agent")
             
-        # History Tab
-        self.history_list = QListWidget()
-        self.history_list.itemClicked.connect(self.load_item)
-        self.tabs.addTab(self.history_list, "History")
+        # History Tab (search box on top, full-text over visited pages)
+        history_tab = QWidget()
+        history_layout = QVBoxLayout(history_tab)
+        history_layout.setContentsMargins(10, 10, 10, 0)
+        self.history_search = QLineEdit()
+        self.history_search.setPlaceholderText("Search history...")
+        self.history_search.setClearButtonEnabled(True)
+        self.history_search.setStyleSheet("""
+            QLineEdit {
+                background-color: #18181b;
+                color: #FAFAFA;
+                border: 1px solid #27272a;
+                border-radius: 8px;
+                padding: 8px;
+            }
+            QLineEdit:focus { border-color: #00F0FF; }
+        """)
+        self.history_search_timer = QTimer(self)
+        self.history_search_timer.setSingleShot(True)
+        self.history_search_timer.setInterval(150)
+        self.history_search_timer.timeout.connect(self.refresh_history)
+        self.history_search.textChanged.connect(lambda _: self.history_search_timer.start())
+        history_layout.addWidget(self.history_search)
+        # Paged models: rows are loaded as the list scrolls, new visits show up on their own
+        self.history_model = HistoryListModel(self)
+        self.history_list = self._make_list_view(self.history_model)
+        history_layout.addWidget(self.history_list)
+        self.tabs.addTab(history_tab, "History")
         
         # Bookmarks Tab
-        self.bookmarks_list = QListWidget()
-        self.bookmarks_list.itemClicked.connect(self.load_item)
+        self.bookmarks_model = BookmarkListModel(self)
+        self.bookmarks_list = self._make_list_view(self.bookmarks_model)
         self.tabs.addTab(self.bookmarks_list, "Bookmarks")
         
         layout.addWidget(self.tabs)
-        
-        self.refresh()
+
+    def _make_list_view(self, model):
+        view = QListView()
+        view.setModel(model)
+        # Rows in a list share one height, so the view never measures them all
+        view.setUniformItemSizes(True)
+        view.clicked.connect(self.load_item)
+        return view
 
     def refresh(self):
-        # Refresh History
-        self.history_list.clear()
-        history = self.data_manager.get_history()
-        for item in history:
-            # Format: Title (URL)
-            display_text = f"{item.get('title', 'No Title')}\n{item.get('url', '')}"
-            list_item = QListWidgetItem(display_text)
-            list_item.setData(Qt.ItemDataRole.UserRole, item.get('url'))
-            self.history_list.addItem(list_item)
-            
-        # Refresh Bookmarks
-        self.bookmarks_list.clear()
-        bookmarks = self.data_manager.get_bookmarks()
-        for item in bookmarks:
-            display_text = f"{item.get('title', 'No Title')}\n{item.get('url', '')}"
-            list_item = QListWidgetItem(display_text)
-            list_item.setData(Qt.ItemDataRole.UserRole, item.get('url'))
-            self.bookmarks_list.addItem(list_item)
+        """Reloads both lists from the top (they follow new visits and bookmarks by themselves)."""
+        self.refresh_history()
+        self.bookmarks_model.reload()
+
+    def refresh_history(self):
+        self.history_model.set_query(self.history_search.text())
+        self.history_list.scrollToTop()
 
-    def load_item(self, item):
-        url = item.data(Qt.ItemDataRole.UserRole)
+    def load_item(self, index):
+        url = index.data(Qt.ItemDataRole.UserRole)
         if url:
             from PyQt6.QtCore import QUrl
-            self.browser_window.add_new_tab(QUrl(url), label="Loading...")
+            from PyQt6.QtWidgets import QApplication
+            # Ctrl+click opens in the background without loading it yet
+            background = bool(QApplication.keyboardModifiers() & Qt.KeyboardModifier.ControlModifier)
+            self.browser_window.add_new_tab(QUrl(url), label="Loading...", background=background)
 
     def show_ai_tab(self):
         if hasattr(self, 'ai_widget'):
@@ -1,11 +1,45 @@
 from PyQt6.QtWidgets import QTabWidget, QTabBar, QWidget, QHBoxLayout, QPushButton
-from PyQt6.QtCore import Qt, QUrl, QSize
-from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import Qt, QUrl, QSize, QTimer
+from PyQt6.QtGui import QIcon, QColor
+from PyQt6 import sip
 from browser.engine import WebView
-from browser.pages import get_new_tab_html
+from browser.extraction import PAGE_TEXT_CACHE
+from browser.governor import memory_governor, LEVEL_TRIM, LEVEL_FREEZE
+from browser.lifecycle import TabLifecyclePolicy
+from browser.performance import active_settings
+from browser.pool import WebViewPool
+from browser.scheduler import LoadScheduler, PRIORITY_BACKGROUND, PRIORITY_PRELOAD
+from browser.session import SessionManager
+from browser.watchdog import RendererWatchdog
 from functools import partial
+import time
+
+# Tab strip prefix for tabs waiting on the load scheduler
+QUEUED_MARK = "⏳ "
+
+class TabPlaceholder(QWidget):
+    """Stand-in for a tab that hasn't been shown yet: just URL, title and favicon."""
+
+    def __init__(self, qurl, label="New Tab", icon=None, parent=None):
+        super().__init__(parent)
+        self.qurl = QUrl(qurl)
+        self.label = label
+        self.icon = icon or QIcon()
+        self.preloaded = False
+        self.session = None  # saved record when restored from a previous session
+        self.setStyleSheet("background: #09090b;")
+
+    # Same accessors as WebView so tab-walking code needn't care
+    def url(self):
+        return self.qurl
+
+    def title(self):
+        return self.label
 
 class TabManager(QTabWidget):
+    # Unviewed background tabs allowed to load ahead of time (the profile can override)
+    PRELOAD_BUDGET = 6
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setTabsClosable(False) # We are using custom buttons
@@ -69,25 +103,85 @@ class TabManager(QTabWidget):
         # Hide the close button on the plus tab specifically
         self.tabBar().setTabButton(i, QTabBar.ButtonPosition.RightSide, None)
         self.tabBar().setTabButton(i, QTabBar.ButtonPosition.LeftSide, None)
+        
+        # Background tabs opened by the user or the agent start as placeholders
+        # and up to preload_budget of them are materialized (one per idle tick)
+        # and handed to the load scheduler, which runs a few at a time and
+        # queues the rest. Restored session tabs stay placeholders until shown.
+        self.preload_budget = active_settings().get("preload_tabs", self.PRELOAD_BUDGET)
+        self._preload_queue = []
+        self._preload_timer = QTimer(self)
+        self._preload_timer.setSingleShot(True)
+        self._preload_timer.setInterval(500)
+        self._preload_timer.timeout.connect(self.preload_next)
+        
+        # Pre-warmed views for instant new tabs
+        self.pool = WebViewPool(self)
+        
+        # Background navigations share a few load slots, the rest queue
+        self.scheduler = LoadScheduler(self)
+        self.scheduler.status_changed.connect(self.on_load_status)
+        
+        # Keep the saved session in step with tab order and selection
+        self.currentChanged.connect(lambda _: SessionManager().schedule_save())
+        self.tabBar().tabMoved.connect(lambda *_: SessionManager().schedule_save())
+        
+        # Crash / hang detection and recovery
+        self.watchdog = RendererWatchdog(self)
+        
+        # Freeze / discard background tabs
+        self.lifecycle = TabLifecyclePolicy(self)
+        self.lifecycle.state_changed.connect(self.on_lifecycle_changed)
+        
+        # Memory budget relief, lightest first
+        governor = memory_governor()
+        governor.register("warm tab pool", self.pool.shrink, LEVEL_TRIM, owner=self)
+        governor.register("page text", PAGE_TEXT_CACHE.shrink, LEVEL_TRIM)
+        governor.register("background tabs", self.lifecycle.shrink, LEVEL_FREEZE, owner=self)
 
-    def add_new_tab(self, qurl=None, label="New Tab"):
+    def add_new_tab(self, qurl=None, label="New Tab", background=False, preload=True):
         
         if qurl is None:
             qurl = QUrl("")
             
-        browser = WebView(self.count(), self)
+        started = time.perf_counter()
+        is_new_tab_page = qurl.toString() in ("", "xenit://newtab")
+        prewarmed = None
+        
+        # Background tabs start as placeholders, Chromium is only spun up when shown
+        if background:
+            widget = TabPlaceholder(qurl, label, parent=self)
+        else:
+            # Blank new tabs come pre-rendered from the pool when one is ready
+            if is_new_tab_page:
+                prewarmed = self.pool.take()
+            widget = prewarmed or WebView(self.count(), self)
         
         # Insert before the last tab (the plus button)
         insert_index = max(0, self.count() - 1)
         
-        i = self.insertTab(insert_index, browser, label)
-        self.setCurrentIndex(i)
+        i = self.insertTab(insert_index, widget, label)
+        self.add_close_button(i, widget)
+        
+        if background:
+            if preload:
+                self._preload_queue.append(widget)
+                if self.preload_budget > 0:
+                    self._preload_timer.start()
+            return widget
         
+        self.setCurrentIndex(i)
+        self.setup_view(widget, qurl, load=prewarmed is None)
+        if is_new_tab_page:
+            self.pool.track_first_paint(widget, started, "warm" if prewarmed else "cold")
+        return widget
+
+    def add_close_button(self, index, widget):
         # Create and set custom close button
         close_btn = QPushButton("✖")
         close_btn.setFixedSize(20, 20)
         close_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        close_btn.setProperty("target_browser", browser) # robust binding
+        close_btn.setProperty("target_browser", widget) # robust binding
         close_btn.setStyleSheet("""
             QPushButton {
                 background: transparent;
@@ -105,16 +199,26 @@ class TabManager(QTabWidget):
         
         close_btn.clicked.connect(self.on_close_click)
         
-        self.tabBar().setTabButton(i, QTabBar.ButtonPosition.RightSide, close_btn)
-        
-        if qurl.toString() == "" or qurl.scheme() == "xenit":
-            browser.setHtml(get_new_tab_html(), QUrl("xenit://newtab"))
+        self.tabBar().setTabButton(index, QTabBar.ButtonPosition.RightSide, close_btn)
+
+    def setup_view(self, browser, qurl, animate=True, load=True, priority=PRIORITY_BACKGROUND):
+        if not load:
+            pass # already showing qurl (pre-warmed view)
+        elif qurl.toString() == "" or qurl.scheme() == "xenit":
+            browser.load_internal(qurl)
         else:
-            browser.load(qurl)
+            # Starts now for the current tab, otherwise when a background slot frees up
+            browser.pending_url = QUrl(qurl)
+            self.scheduler.load(browser, qurl, priority)
             
         browser.titleChanged.connect(lambda title: self.setTabText(self.indexOf(browser), title[:20]))
         browser.iconChanged.connect(lambda icon: self.setTabIcon(self.indexOf(browser), icon))
         browser.urlChanged.connect(lambda url: self.window().update_url_bar(url, browser))
+        SessionManager().watch(browser)
+        self.watchdog.watch(browser)
+        
+        if not animate:
+            return
         
         # Add fade-in animation for smoother transition
         from PyQt6.QtCore import QPropertyAnimation, QEasingCurve
@@ -139,9 +243,48 @@ class TabManager(QTabWidget):
         
         # Keep reference to animation to prevent garbage collection
         browser.fadeInAnim = anim
+
+    def materialize(self, placeholder, activate=True):
+        """Swaps a placeholder for a real WebView in the same slot. Returns the view."""
+        if placeholder in self._preload_queue:
+            self._preload_queue.remove(placeholder)
+        index = self.indexOf(placeholder)
+        if index == -1:
+            return None
+            
+        current = self.currentWidget()
+        browser = WebView(index, self)
+        browser.preloaded = not activate
         
+        # Swap silently so the intermediate current-tab changes don't fire
+        self.blockSignals(True)
+        self.removeTab(index)
+        self.insertTab(index, browser, placeholder.label)
+        self.setTabIcon(index, placeholder.icon)
+        self.add_close_button(index, browser)
+        self.setCurrentWidget(browser if activate else current)
+        self.blockSignals(False)
+        placeholder.deleteLater()
+        
+        if placeholder.session:
+            browser.restore_session(placeholder.session)
+        self.setup_view(browser, placeholder.qurl, animate=activate,
+                        priority=PRIORITY_BACKGROUND if activate else PRIORITY_PRELOAD)
+        if activate:
+            self.currentChanged.emit(index)
         return browser
 
+    def preload_next(self):
+        # Warm up queued background tabs while the preload budget allows
+        # Drop placeholders closed behind our back (e.g. by the agent)
+        self._preload_queue = [p for p in self._preload_queue if not sip.isdeleted(p) and self.indexOf(p) != -1]
+        preloaded = sum(1 for i in range(self.count()) if getattr(self.widget(i), 'preloaded', False))
+        if preloaded >= self.preload_budget or not self._preload_queue:
+            return
+        self.materialize(self._preload_queue[0], activate=False)
+        if self._preload_queue:
+            self._preload_timer.start()
+
     def on_close_click(self):
         btn = self.sender()
         if not btn:
@@ -165,6 +308,8 @@ class TabManager(QTabWidget):
             
         # Get the widget BEFORE removing it
         widget = self.widget(index)
+        if widget in self._preload_queue:
+            self._preload_queue.remove(widget)
         
         self.removeTab(index)
         
@@ -175,6 +320,40 @@ class TabManager(QTabWidget):
         if self.count() == 1:
             self.add_new_tab()
 
+    def tabInserted(self, index):
+        super().tabInserted(index)
+        SessionManager().schedule_save()
+
+    def tabRemoved(self, index):
+        super().tabRemoved(index)
+        SessionManager().schedule_save()
+
+    def on_load_status(self, browser, status):
+        index = self.indexOf(browser)
+        if index == -1:
+            return
+        text = self.tabText(index)
+        if text.startswith(QUEUED_MARK):
+            text = text[len(QUEUED_MARK):]
+        if status == "queued":
+            self.setTabText(index, QUEUED_MARK + text)
+            self.setTabToolTip(index, f"Waiting to load (#{self.scheduler.position(browser)} in queue)")
+        else:
+            self.setTabText(index, text)
+            self.setTabToolTip(index, "Loading in background" if status == "loading" else "")
+
+    def on_lifecycle_changed(self, browser, state):
+        index = self.indexOf(browser)
+        if index == -1:
+            return
+        # Sleeping tabs are dimmed in the strip
+        if state == "active":
+            self.setTabToolTip(index, "")
+            self.tabBar().setTabTextColor(index, QColor())
+        else:
+            self.setTabToolTip(index, f"{state.capitalize()} - resumes when opened")
+            self.tabBar().setTabTextColor(index, QColor("#52525B"))
+
     def tab_changed(self, index):
         # Check if the plus tab was clicked
         if index == self.count() - 1 and self.count() > 0:
@@ -183,6 +362,11 @@ class TabManager(QTabWidget):
             return
 
         current_widget = self.currentWidget()
+        if isinstance(current_widget, TabPlaceholder):
+            # First time this tab is shown: create the real view now
+            self.materialize(current_widget)
+            return
         if current_widget and isinstance(current_widget, WebView):
+            current_widget.preloaded = False
             if hasattr(self.window(), 'update_url_bar'):
                 self.window().update_url_bar(current_widget.url(), current_widget)
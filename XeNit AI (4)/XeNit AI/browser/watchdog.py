@@ -0,0 +1,217 @@
+import json
+import os
+import signal
+import time
+from collections import deque
+from datetime import datetime
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWebEngineCore import QWebEnginePage
+from browser.persistence import WriteBehind
+
+TerminationStatus = QWebEnginePage.RenderProcessTerminationStatus
+LifecycleState = QWebEnginePage.LifecycleState
+
+STATUS_NAMES = {
+    TerminationStatus.NormalTerminationStatus: "normal",
+    TerminationStatus.AbnormalTerminationStatus: "abnormal",
+    TerminationStatus.CrashedTerminationStatus: "crashed",
+    TerminationStatus.KilledTerminationStatus: "killed",
+}
+
+class RendererWatchdog(QObject):
+    """Notices crashed and hung renderers and brings their tabs back.
+
+    Crashes arrive through renderProcessTerminated. Hangs are found with a
+    heartbeat: every HEARTBEAT_MS each loaded, unfrozen tab gets a trivial
+    runJavaScript probe, and a probe still unanswered HANG_TIMEOUT_MS later
+    means the renderer is stuck. Every incident is logged to
+    ~/.xenit_browser/incidents.log (JSON lines, the last MAX_LOG_LINES kept)
+    with its timings.
+    """
+
+    HEARTBEAT_MS = 10000
+    HANG_TIMEOUT_MS = 5000
+    LOAD_GRACE_SEC = 30
+    # More crashes than this within CRASH_WINDOW_SEC and the tab is left alone
+    MAX_CRASHES = 3
+    CRASH_WINDOW_SEC = 60
+    MAX_LOG_LINES = 500
+
+    def __init__(self, tab_manager):
+        super().__init__(tab_manager)
+        self.tabs = tab_manager
+        self.log_file = os.path.join(os.path.expanduser("~"), ".xenit_browser", "incidents.log")
+        self.incidents = []      # most recent last, capped
+        self._log_lines = deque(self._read_log(), maxlen=self.MAX_LOG_LINES)
+        self._watched = set()
+        self._loading = {}       # view -> monotonic time its current load started
+        self._probes = {}        # view -> monotonic time the unanswered probe was sent
+        self._hangs = {}         # view -> consecutive hang detections
+        self._crashes = {}       # view -> [monotonic times]
+        self._needs_reload = set()
+        self._terminating = set()  # renderers we ended ourselves after a hang
+
+        self.tabs.currentChanged.connect(self._on_current_changed)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.heartbeat)
+        self.timer.start(self.HEARTBEAT_MS)
+
+    def watch(self, view):
+        if view in self._watched:
+            return
+        self._watched.add(view)
+        page = view.page()
+        page.renderProcessTerminated.connect(
+            lambda status, code, view=view: self._on_terminated(view, status, code))
+        view.loadStarted.connect(lambda view=view: self._on_load_started(view))
+        view.loadFinished.connect(lambda ok, view=view: self._loading.pop(view, None))
+        view.destroyed.connect(lambda *_, view=view: self._forget(view))
+
+    def _forget(self, view):
+        for store in (self._watched, self._needs_reload, self._terminating):
+            store.discard(view)
+        for store in (self._loading, self._probes, self._hangs, self._crashes):
+            store.pop(view, None)
+
+    def _on_load_started(self, view):
+        # Probes sent to the old document may never be answered
+        self._loading[view] = time.monotonic()
+        self._probes.pop(view, None)
+
+    # --- Crashes ---
+
+    def _on_terminated(self, view, status, exit_code):
+        if status == TerminationStatus.NormalTerminationStatus:
+            return
+        now = time.monotonic()
+        self._probes.pop(view, None)
+        self._loading.pop(view, None)
+        crashes = [t for t in self._crashes.get(view, []) if now - t < self.CRASH_WINDOW_SEC]
+        crashes.append(now)
+        self._crashes[view] = crashes
+
+        name = STATUS_NAMES.get(status, "abnormal")
+        after_hang = view in self._terminating
+        self._terminating.discard(view)
+        if len(crashes) > self.MAX_CRASHES:
+            action = "gave up"
+        elif view is not self.tabs.currentWidget():
+            # Out of sight (or ended from the task manager): reload when shown again
+            action = "reload on activation"
+            self._needs_reload.add(view)
+        else:
+            action = "reloaded"
+        incident = self._record(view, "crash", status=name, exit_code=exit_code, action=action,
+                                after_hang=after_hang)
+        if action == "reloaded":
+            self._recover(view, incident)
+
+    def _on_current_changed(self, index):
+        view = self.tabs.widget(index)
+        if view in self._needs_reload:
+            self._needs_reload.discard(view)
+            incident = self._record(view, "deferred reload", action="reloaded on activation")
+            self._recover(view, incident)
+
+    def _recover(self, view, incident):
+        """Reloads the tab in place, keeping its scroll offset and restored back/forward entries."""
+        pos = view.page().scrollPosition()
+        if hasattr(view, 'restore_session'):
+            view.restore_session({
+                "back": view.session_back,
+                "forward": view.session_forward,
+                "scroll": [int(pos.x()), int(pos.y())],
+            })
+        started = time.monotonic()
+
+        def on_loaded(ok):
+            view.loadFinished.disconnect(on_loaded)
+            incident["recovered"] = ok
+            incident["recovery_ms"] = round((time.monotonic() - started) * 1000)
+            self._append_log(dict(incident, kind="recovered", cause=incident["kind"]))
+        view.loadFinished.connect(on_loaded)
+        # Built-in pages are rendered with setHtml(), they have nothing to reload
+        if view.url().scheme() == "xenit" and hasattr(view, 'load_internal'):
+            view.load_internal(view.url())
+        else:
+            view.reload()
+
+    # --- Hangs ---
+
+    def heartbeat(self):
+        now = time.monotonic()
+        for i in range(self.tabs.count()):
+            view = self.tabs.widget(i)
+            if view not in self._watched:
+                continue
+            # A navigation in progress gets a grace period, a load that never ends doesn't
+            load_started = self._loading.get(view)
+            if load_started is not None and now - load_started < self.LOAD_GRACE_SEC:
+                continue
+            page = view.page()
+            if page.lifecycleState() != LifecycleState.Active or not page.renderProcessPid():
+                continue  # frozen/discarded tabs answer nothing by design
+            sent = self._probes.get(view)
+            if sent is None:
+                self._probes[view] = now
+                page.runJavaScript("1", lambda _result, view=view: self._on_pong(view))
+            elif (now - sent) * 1000 >= self.HANG_TIMEOUT_MS:
+                self._on_hang(view, now - sent)
+
+    def _on_pong(self, view):
+        self._probes.pop(view, None)
+        self._hangs.pop(view, None)
+
+    def _on_hang(self, view, waited):
+        hangs = self._hangs.get(view, 0) + 1
+        self._hangs[view] = hangs
+        self._probes.pop(view, None)
+        page = view.page()
+        if view is not self.tabs.currentWidget() and self.tabs.lifecycle.discard(view):
+            # Out of sight: drop the renderer, the tab reloads when shown
+            self._record(view, "hang", waited_ms=round(waited * 1000), action="discarded")
+        elif hangs == 1:
+            incident = self._record(view, "hang", waited_ms=round(waited * 1000), action="reloaded")
+            self._recover(view, incident)
+        else:
+            # Still stuck after a reload: end the renderer, crash recovery takes it from there
+            pid = page.renderProcessPid()
+            self._record(view, "hang", waited_ms=round(waited * 1000), action="terminated renderer", pid=pid)
+            self._hangs.pop(view, None)
+            if pid:
+                self._terminating.add(view)
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError as e:
+                    print(f"XeNit Watchdog: Could not end renderer {pid}: {e}")
+
+    # --- Incident log ---
+
+    def _record(self, view, kind, **details):
+        url = view.url().toString()
+        incident = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "kind": kind,
+            "url": url,
+            "site": view.url().host().rstrip('.'),
+        }
+        incident.update(details)
+        self.incidents.append(incident)
+        del self.incidents[:-200]
+        print(f"XeNit Watchdog: {kind} on {incident['site'] or url} -> {details.get('action')}")
+        self._append_log(incident)
+        return incident
+
+    def _read_log(self):
+        # Streamed into the bounded deque, so an old uncapped log costs one pass
+        try:
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                yield from f
+        except OSError:
+            return
+
+    def _append_log(self, incident):
+        # The whole (capped) log is rewritten by the persistence thread,
+        # several incidents within its flush interval cost one write
+        self._log_lines.append(json.dumps(incident) + "\n")
+        WriteBehind().schedule(self.log_file, "".join(self._log_lines))
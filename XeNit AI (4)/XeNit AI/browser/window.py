@@ -2,7 +2,7 @@ from PyQt6.QtWidgets import (QMainWindow, QToolBar, QLineEdit, QVBoxLayout,
                              QWidget, QHBoxLayout, QLabel, QMenu, QSizePolicy, QPushButton,
                              QSplitter, QGraphicsDropShadowEffect)
 from PyQt6.QtCore import Qt, QSize, QUrl
-from PyQt6.QtGui import QIcon, QAction, QColor
+from PyQt6.QtGui import QIcon, QAction, QColor, QShortcut, QKeySequence
 import urllib.parse
 
 from browser.tabs import TabManager
@@ -10,8 +10,11 @@ from browser.menu import CustomMenu
 from browser.data_manager import DataManager
 from browser.sidebar import Sidebar
 from browser.dialogs import (HistoryDialog, BookmarksDialog, DownloadsDialog, 
-                             SettingsDialog, HelpDialog, SignInDialog)
+                             SettingsDialog, HelpDialog, SignInDialog, TaskManagerDialog)
 from browser.memory import MemoryManager
+from browser.session import SessionManager
+from browser.resources import ResourceMonitor
+from browser.omnibox import Omnibox
 from browser.ai_agent import AIAgent
 from browser.voice import VoiceManager
 
@@ -42,11 +45,11 @@ class BrowserWindow(QMainWindow):
             def __init__(self, window):
                 self.window = window
             
-            def open_url(self, url):
+            def open_url(self, url, background=False):
                 # Ensure URL has scheme
                 if "://" not in url:
                     url = "https://" + url
-                return self.window.add_new_tab(QUrl(url), "Loading...")
+                return self.window.add_new_tab(QUrl(url), "Loading...", background=background)
                 
             def play_music(self, query):
                 # Search on YouTube
@@ -310,6 +313,17 @@ class BrowserWindow(QMainWindow):
         self.tabs = TabManager(self)
         self.splitter.addWidget(self.tabs)
         
+        # Ctrl+T: new tab (served from the pre-warmed pool when possible)
+        self.new_tab_shortcut = QShortcut(QKeySequence("Ctrl+T"), self)
+        self.new_tab_shortcut.activated.connect(lambda: self.add_new_tab())
+        
+        # Shift+Esc: task manager
+        self.task_manager_shortcut = QShortcut(QKeySequence("Shift+Esc"), self)
+        self.task_manager_shortcut.activated.connect(self.open_task_manager)
+        
+        # Per-tab CPU / memory / network sampling
+        self.resources = ResourceMonitor(self.tabs)
+        
         # Tab Health Monitor
         self.cleanup_proposal = None
         self.last_cleanup_prompt = 0
@@ -323,8 +337,10 @@ class BrowserWindow(QMainWindow):
         self.splitter.setStretchFactor(1, 1)
         self.splitter.setCollapsible(0, False) # Can't fully collapse sidebar via dragging, button does it
 
-        # Load initial tab
-        self.add_new_tab(QUrl("xenit://newtab"), "New Tab")
+        # Restore the previous session (only the active tab loads), or start fresh
+        self.session = SessionManager()
+        if not self.session.restore_window(self):
+            self.add_new_tab(QUrl("xenit://newtab"), "New Tab")
         
         # Apply Styles for URL Bar uniqueness, reusing pill aesthetic
         self.url_bar.setStyleSheet("""
@@ -431,8 +447,8 @@ class BrowserWindow(QMainWindow):
             btn.setFixedSize(36, 36)
             btn.setStyleSheet(btn_style)
         
-        self.back_btn.clicked.connect(lambda: self.tabs.currentWidget().back())
-        self.fwd_btn.clicked.connect(lambda: self.tabs.currentWidget().forward())
+        self.back_btn.clicked.connect(lambda: self.tabs.currentWidget().go_back())
+        self.fwd_btn.clicked.connect(lambda: self.tabs.currentWidget().go_forward())
         self.reload_btn.clicked.connect(lambda: self.tabs.currentWidget().reload())
 
         # Removed Library/Sidebar button as requested
@@ -445,7 +461,9 @@ class BrowserWindow(QMainWindow):
         # URL Bar (Pill Shape)
         self.url_bar = QLineEdit()
         self.url_bar.setPlaceholderText("Search or enter address")
-        self.url_bar.returnPressed.connect(self.navigate_to_url)
+        # History / bookmark suggestions while typing, ranked by frecency;
+        # also handles Return, so a highlighted suggestion navigates only once
+        self.omnibox = Omnibox(self.url_bar, self.navigate_to_url)
         # Style set in init for specificity, but layout added here
         self.tb_layout.addWidget(self.url_bar)
         
@@ -493,7 +511,7 @@ class BrowserWindow(QMainWindow):
         else:
             self.sidebar.show()
 
-    def add_new_tab(self, qurl=None, label="New Tab"):
+    def add_new_tab(self, qurl=None, label="New Tab", background=False, preload=True):
         # Apply Dot Trick globally to ALL new tabs (AI, Links, User)
         if qurl and isinstance(qurl, QUrl):
              host = qurl.host().lower()
@@ -502,10 +520,10 @@ class BrowserWindow(QMainWindow):
                  qurl.setHost(new_host)
                  print(f"XeNit AdBlock: Applied Dot Trick (Global) -> {qurl.toString()}")
         
-        return self.tabs.add_new_tab(qurl, label)
+        return self.tabs.add_new_tab(qurl, label, background=background, preload=preload)
 
     def go_home(self):
-        self.tabs.currentWidget().setUrl(QUrl("xenit://newtab"))
+        self.tabs.currentWidget().load_internal(QUrl("xenit://newtab"))
 
     def navigate_to_url(self):
         text = self.url_bar.text()
@@ -513,6 +531,11 @@ class BrowserWindow(QMainWindow):
             return
             
         url = QUrl(text)
+        # Built-in pages (xenit://newtab, xenit://adblock) are rendered locally
+        if url.scheme() == "xenit":
+            self.tabs.currentWidget().load_internal(url)
+            return
+            
         if url.scheme() == "":
             if "." in text:
                 url.setScheme("http")
@@ -556,6 +579,8 @@ class BrowserWindow(QMainWindow):
         menu.history_action.triggered.connect(self.open_history)
         menu.bookmarks_action.triggered.connect(self.open_bookmarks)
         menu.downloads_action.triggered.connect(self.open_downloads)
+        menu.adblock_action.triggered.connect(lambda: self.add_new_tab(QUrl("xenit://adblock"), "XeNit Shield"))
+        menu.task_manager_action.triggered.connect(self.open_task_manager)
         
         menu.settings_action.triggered.connect(self.open_settings)
         menu.help_action.triggered.connect(self.open_help)
@@ -564,6 +589,10 @@ class BrowserWindow(QMainWindow):
         # Show relative to button
         menu.exec(self.menu_btn.mapToGlobal(self.menu_btn.rect().bottomLeft()))
 
+    def closeEvent(self, event):
+        self.session.window_closed(self)
+        super().closeEvent(event)
+
     def open_new_window(self):
         # Create a new instance of BrowserWindow
         new_win = BrowserWindow()
@@ -586,6 +615,10 @@ class BrowserWindow(QMainWindow):
         dlg = DownloadsDialog(self)
         dlg.exec()
 
+    def open_task_manager(self):
+        dlg = TaskManagerDialog(self.resources, self.tabs.lifecycle, self)
+        dlg.exec()
+
     def open_settings(self):
         dlg = SettingsDialog(self)
         dlg.exec()
@@ -10,6 +10,8 @@ except ImportError:
     pass # Handle gracefully or improved error
 
 from browser.styles import GLOBAL_STYLES
+from browser.data_manager import DataManager
+from browser.performance import apply_performance_profile, SETTING_KEY
 # We will import BrowserWindow later once created, to avoid immediate error during batch creation
 # from browser.window import BrowserWindow 
 
@@ -26,6 +28,9 @@ def main():
     # Share contexts for faster WebGL
     QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts, True)
 
+    # Chromium flags for the chosen performance profile (--perf-profile NAME overrides the saved one)
+    apply_performance_profile(sys.argv, DataManager().get_setting(SETTING_KEY))
+
     app = QApplication(sys.argv)
     app.setApplicationName("XeNit Browser")
     app.setOrganizationName("GoogleDeepmind_Agent")
@@ -44,6 +49,8 @@ def main():
     
     def on_splash_finished():
         window.showMaximized()
+        # Any further windows from the last session
+        window.session.restore_remaining_windows(BrowserWindow)
         # window.show() 
     
     splash.finished.connect(on_splash_finished)
@@ -0,0 +1,88 @@
+import unittest
+from browser.session import merge_history, step_history
+
+class FakeHistory:
+    """Chromium's side of a tab: entries, current index, and clear() keeping the current entry."""
+
+    def __init__(self, url):
+        self.entries = [[url, url]]
+        self.index = 0
+
+    def navigate(self, url):
+        del self.entries[self.index + 1:]
+        self.entries.append([url, url])
+        self.index = len(self.entries) - 1
+
+    def clear(self):
+        self.entries = [self.entries[self.index]]
+        self.index = 0
+
+class FakeTab:
+    """Mirrors WebView.go_back/go_forward/_step_session over a FakeHistory."""
+
+    def __init__(self, record):
+        self.history = FakeHistory(record["url"])
+        self.session_back = list(record["back"])
+        self.session_forward = list(record["forward"])
+        self.history_floor = 0
+
+    def url(self):
+        return self.history.entries[self.history.index][0]
+
+    def go_back(self):
+        if self.history.index > self.history_floor:
+            self.history.index -= 1
+        else:
+            self._step(-1)
+
+    def go_forward(self):
+        if self.history.index < len(self.history.entries) - 1:
+            self.history.index += 1
+        else:
+            self._step(1)
+
+    def _step(self, direction):
+        back, forward = self.record()
+        current = self.history.entries[self.history.index]
+        target, self.session_back, self.session_forward = step_history(back, current, forward, direction)
+        self.history.clear()
+        self.history_floor = len(self.history.entries)
+        self.history.navigate(target[0])
+
+    def record(self):
+        return merge_history(self.history.entries, self.history.index, self.history_floor,
+                             self.session_back, self.session_forward)
+
+def urls(entries):
+    return [e[0] for e in entries]
+
+class SessionHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.tab = FakeTab({"url": "c", "back": [["a", "a"], ["b", "b"]], "forward": [["d", "d"]]})
+
+    def assertStack(self, back, current, forward):
+        record_back, record_forward = self.tab.record()
+        self.assertEqual(urls(record_back), back)
+        self.assertEqual(self.tab.url(), current)
+        self.assertEqual(urls(record_forward), forward)
+
+    def test_back_and_forward_across_restored_boundary(self):
+        self.tab.go_back()
+        self.assertStack(["a"], "b", ["c", "d"])
+        self.tab.go_back()
+        self.assertStack([], "a", ["b", "c", "d"])
+        self.tab.go_forward()
+        self.assertStack(["a"], "b", ["c", "d"])
+        self.tab.go_forward()
+        self.tab.go_forward()
+        self.assertStack(["a", "b", "c"], "d", [])
+
+    def test_saved_record_survives_repeated_restore(self):
+        self.tab.go_back()
+        for _ in range(3):
+            back, forward = self.tab.record()
+            self.tab = FakeTab({"url": self.tab.url(), "back": back, "forward": forward})
+        self.assertStack(["a"], "b", ["c", "d"])
+
+if __name__ == "__main__":
+    unittest.main()